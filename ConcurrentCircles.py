@@ -1,164 +1,690 @@
-from typing import List
-import math
-import random
 import os
 import csv
+import json
 import multiprocessing
-from time import process_time
-
-
-class Circle:
-    """
-    Represents a circle
-    """
-
-    def __init__(self, center_x: float, center_y: float, radius: float):
-        """
-        center_x: x coordinate of center
-        center_y: y coordinate of center
-        radius: radius of circle
-        """
-        self.center_x = center_x
-        self.center_y = center_y
-        self.radius = radius
-        self.y_low = center_y - radius
-        self.y_high = center_y + radius
-        self.x_0: float = 0.0  # the left intersection point of this circle with the scan line
-        self.x_1: float = 0.0  # the right intersection point of this circle with the scan line
-
-    def __eq__(self, other):
-        return self.center_x == other.center_x and self.center_y == other.center_y and self.radius == other.radius
+from multiprocessing import resource_tracker, shared_memory
+import queue
+import argparse
+import sys
+import traceback
+from collections import Counter
+from progress import ProgressMonitor, ProgressReporter
+from time import perf_counter, process_time
+from shared_gazes import share_trials, trial_columns
+from result_cache import ResultCache, trial_cache_key
+from scheduler import default_num_workers, estimate_cost, monte_carlo_cost, plan_bands, trial_rows
+from circles import CircleSet
+from gaze_store import GazeStore, is_current, store_directory, stream_store
+from area_engines import AREA_ENGINES, MONTE_CARLO_SAMPLERS, area_timeline, bounding_box, grouped_sweep_area, \
+    trial_area, trial_monte_carlo
 
 
 class CircleWorker(multiprocessing.Process):
 
-    def __init__(self, task_queue, results_queue, trial_min_max_data, gazes_data, step_size,
-                 err_tolerance):
+    def __init__(self, task_queue, results_queue, area_engine='scanline', monte_carlo_sampler='uniform',
+                 monte_carlo_seed=None, decompose=False, progress_queue=None, timeline=False, label_overlaps=False,
+                 error_target=None):
         multiprocessing.Process.__init__(self)
         self.task_queue = task_queue
         self.results_queue = results_queue
-        self.trial_min_max_data = trial_min_max_data
-        self.gazes_data = gazes_data
-        self.step_size = step_size
-        self.err_tolerance = err_tolerance
+        self.progress_queue = progress_queue
+        self.area_engine = area_engine
+        self.monte_carlo_sampler = monte_carlo_sampler
+        self.monte_carlo_seed = monte_carlo_seed
+        self.decompose = decompose
+        self.timeline = timeline
+        self.label_overlaps = label_overlaps
+        self.error_target = error_target
 
     def run(self):
         while True:
-            next_task = self.task_queue.get() # task is the tuple (file number, trial number)
+            # task is the tuple (job index, position of the trial in the job, (data file, file number, trial number),
+            # step size, error tolerance, (shared block name, rows in the block, offset of the trial, rows of the
+            # trial), bounding box of the trial, band) where band is None for a whole trial, or (index of the band,
+            # number of bands, first row, last row) for one band of rows of a trial split between several workers,
+            # labels of the gazes by label column or None)
+            next_task = self.task_queue.get()
             if next_task is None:
                 self.task_queue.task_done()
                 break
-            # append pieces of the result to this list, which will get stitched together
-            # at the end, for performance reasons
-            # https://waymoot.org/home/python_string/
-            result_list = []
-            min_max_data = self.trial_min_max_data[next_task]
-            gazes_data = self.gazes_data[next_task]
-            for x in range(3):
-                result_list.append("-----------------")
-            result_list.append("\n")
-            step = 1 / (1 << self.step_size)
-            y_min_step = int(math.floor(min_max_data['y_min'] / step))
-            y_max_step = int(math.ceil(min_max_data['y_max'] / step))
-            area: float = intersection_area(gazes_data, y_min_step, y_max_step, step)
-            result_list.append("File Number: {}\n".format(next_task[0]))
-            result_list.append("Trial Number: {}\n".format(next_task[1]))
-            scanline_result_str = \
-                "The total area of covered by the gazes is {:2f}, based on the scanline method\n".format(area)
-            result_list.append(scanline_result_str)
-            result_list.extend(monte_carlo_sampling(min_max_data['x_min'], min_max_data['y_min'],
-                                 min_max_data['x_max'], min_max_data['y_max'],
-                                 65536, gazes_data, self.err_tolerance))
-            result_str = "".join(result_list)
+            job_index, sequence, trial_key, step_size, err_tolerance, block_rows, min_max_data, band, \
+                labels = next_task
+            block_name, num_rows, offset, count = block_rows
+            block = shared_memory.SharedMemory(block_name)
+            gazes_data = None
+            try:
+                # the CircleSet wraps the trial's rows in the block rather than copying them, so the block is kept
+                # open until the trial's result has been sent
+                gazes_data = CircleSet(*trial_columns(block, num_rows, offset, count), labels=labels, copy=False)
+                record = self.trial_record(trial_key, gazes_data, step_size, err_tolerance, min_max_data, band,
+                                           labels)
+            except Exception:
+                # the parent waits for a result of every task, so a trial that fails still sends one, which the
+                # parent raises
+                record = {'data_file': trial_key[0], 'file_num': trial_key[1], 'trial_num': trial_key[2],
+                          'error': traceback.format_exc()}
+            finally:
+                # the views of the block must all be released before it can be closed
+                gazes_data = None
+                block.close()
             self.task_queue.task_done()
-            self.results_queue.put(result_str)
+            self.results_queue.put((job_index, sequence, block_name, band, record))
         return
 
+    def trial_record(self, trial_key, gazes_data, step_size, err_tolerance, min_max_data, band, labels):
+        """
+        Calculates the area of a trial, or of one band of rows of it, and the trial's Monte Carlo estimate and
+        breakdowns
+        :return: the record of the trial, as written by a ResultCollector
+        """
+        _, file_num, trial_num = trial_key
+        progress = None
+        if self.progress_queue is not None:
+            label = "{}:{}:{} n={} tol={}".format(os.path.basename(trial_key[0]), file_num, trial_num,
+                                                  step_size, err_tolerance)
+            if band is not None:
+                label += " band {}/{}".format(band[0] + 1, band[1])
+            progress = ProgressReporter(self.progress_queue.put, label)
+        area_start = perf_counter()
+        label_areas = None
+        rows = None if band is None else band[2:]
+        if labels is not None and not self.decompose and self.area_engine in LABEL_SWEEP_ENGINES:
+            # the sweep which breaks the area down by label also yields the area of the trial, so the trial (or
+            # the band) is swept once rather than once for the area and once for the labels
+            area, label_areas, label_overlaps = label_breakdown(gazes_data, min_max_data, step_size,
+                                                                self.area_engine, self.label_overlaps,
+                                                                progress=progress, rows=rows)
+            first_row, last_row = rows if rows is not None else trial_rows(min_max_data, step_size)
+            num_evaluations = last_row - first_row + 1
+        else:
+            area, num_evaluations = trial_area(self.area_engine, gazes_data, min_max_data, step_size,
+                                               self.decompose, progress, rows, self.error_target)
+        area_seconds = perf_counter() - area_start
+        # only the first band of a split trial runs the Monte Carlo sampler
+        estimates = [(None, None, None)]
+        monte_carlo_seconds = None
+        if band is None or band[0] == 0:
+            # seed each trial from its key, so a trial's estimate does not depend on which worker picks it up
+            seed = None if self.monte_carlo_seed is None else (self.monte_carlo_seed, file_num, trial_num)
+            monte_carlo_start = perf_counter()
+            estimates = trial_monte_carlo(self.monte_carlo_sampler, gazes_data, min_max_data, err_tolerance, seed,
+                                          self.decompose, progress)
+            monte_carlo_seconds = perf_counter() - monte_carlo_start
+        monte_carlo_area, monte_carlo_std_dev, monte_carlo_samples = estimates[-1]
+        record = {'data_file': trial_key[0], 'file_num': file_num, 'trial_num': trial_num,
+                  'num_gazes': len(gazes_data), 'step_size': step_size, 'error_tolerance': err_tolerance,
+                  'area_engine': self.area_engine, 'area': area, 'area_evaluations': num_evaluations,
+                  'area_seconds': area_seconds,
+                  'monte_carlo_sampler': self.monte_carlo_sampler, 'monte_carlo_area': monte_carlo_area,
+                  'monte_carlo_std_dev': monte_carlo_std_dev, 'monte_carlo_samples': monte_carlo_samples,
+                  'monte_carlo_seconds': monte_carlo_seconds, 'monte_carlo_rounds': estimates}
+        if self.timeline and (band is None or band[0] == 0):
+            record['area_timeline'] = area_timeline(gazes_data)
+        if labels is not None:
+            if label_areas is None:
+                # every band breaks down its own rows, the bands' breakdowns are added up with their areas
+                _, label_areas, label_overlaps = label_breakdown(gazes_data, min_max_data, step_size,
+                                                                 self.area_engine, self.label_overlaps,
+                                                                 self.decompose, progress, rows, self.error_target)
+            record['label_areas'], record['label_overlaps'] = label_areas, label_overlaps
+        if progress is not None:
+            progress.finish()
+        return record
+
+
+# the engines whose area the label sweep reproduces, so that a trial with labels is only swept once
+LABEL_SWEEP_ENGINES = ('scanline', 'sweep')
+
+
+def label_breakdown(circles: CircleSet, min_max_data, step_size: int, area_engine='sweep', overlaps=False,
+                    decompose=False, progress=None, rows=None, error_target=None):
+    """
+    Calculates the area covered by the gazes of each label of each label column of a trial, e.g. of each interest
+    area, with the same engine as the area of the trial. The scanline engines do it in a single sweep over the trial
+    whatever the number of labels, any other engine calculates the union of the gazes of each label and of each pair
+    of labels on its own, the overlap of two labels being |A| + |B| - |A u B|.
+    :param circles: a CircleSet whose labels hold the label columns
+    :param min_max_data: the bounding box of the trial
+    :param step_size: the scanline step will be 1 / 2 ^ step_size
+    :param area_engine: the engine which calculates the area, one of AREA_ENGINES
+    :param overlaps: if True, the area where the gazes of two labels of the same column overlap is also calculated
+    :param decompose: if True, each cluster of overlapping gazes is computed over its own bounding box
+    :param progress: a ProgressReporter to report the rows or chord widths processed to
+    :param rows: the (first, last) indices of the rows of the band to break down, by default every row of the trial
+    :param error_target: the absolute error target of the adaptive engine, by default the scanline step
+    :return: the area covered by all the gazes, the same as the engine's, or None if the engine does not yield it
+    along the way, {column: {label: area}}, and {column: [[label, other label, area of their overlap], ...]} (the
+    lists are empty unless overlaps)
+    """
+    groups = []
+    pairs = []
+    memberships = [[] for _ in range(len(circles))]
+    for column, labels in circles.labels.items():
+        first_group = len(groups)
+        column_groups = {label: first_group + k for k, label in enumerate(sorted(set(labels)))}
+        groups.extend((column, label) for label in sorted(column_groups))
+        for i, label in enumerate(labels):
+            memberships[i].append(column_groups[label])
+        if overlaps:
+            pairs.extend((group, other_group) for group in range(first_group, len(groups))
+                         for other_group in range(group + 1, len(groups)))
+    if area_engine in LABEL_SWEEP_ENGINES and not decompose:
+        y_min_step, y_max_step = rows if rows is not None else trial_rows(min_max_data, step_size)
+        total, group_areas, pair_areas = grouped_sweep_area(circles, memberships, len(groups), y_min_step,
+                                                            y_max_step, 1 / (1 << step_size), pairs, progress)
+    else:
+        members = [[] for _ in groups]
+        for i, circle_groups in enumerate(memberships):
+            for group in circle_groups:
+                members[group].append(i)
+
+        def union_area(indices):
+            subset = CircleSet(circles.center_x[indices], circles.center_y[indices], circles.radius[indices])
+            return trial_area(area_engine, subset, subset.min_max_data, step_size, decompose, progress, rows,
+                              error_target)[0]
+
+        total = None
+        group_areas = [union_area(indices) for indices in members]
+        # the overlap of two disjoint labels comes out as the rounding error of the engine, which may be negative
+        pair_areas = [max(0.0, group_areas[group] + group_areas[other_group]
+                          - union_area(members[group] + members[other_group]))
+                      for group, other_group in pairs]
+
+    label_areas = {column: {} for column in circles.labels}
+    for (column, label), area in zip(groups, group_areas):
+        label_areas[column][label] = area
+    label_overlaps = {column: [] for column in circles.labels}
+    for (group, other_group), area in zip(pairs, pair_areas):
+        label_overlaps[groups[group][0]].append([groups[group][1], groups[other_group][1], area])
+    return total, label_areas, label_overlaps
+
+
+OUTPUT_FORMATS = ('text', 'csv', 'jsonl')
+OUTPUT_EXTENSIONS = {'text': 'txt', 'csv': 'csv', 'jsonl': 'jsonl'}
+
+# the columns of the csv output, the jsonl output also has every Monte Carlo round
+RESULT_FIELDS = ('data_file', 'file_num', 'trial_num', 'num_gazes', 'step_size', 'error_tolerance', 'area_engine',
+                 'area', 'area_evaluations', 'area_seconds', 'monte_carlo_sampler', 'monte_carlo_area',
+                 'monte_carlo_std_dev', 'monte_carlo_samples', 'monte_carlo_seconds')
+
+# the columns of the timeline output, one row per fixation
+TIMELINE_FIELDS = ('data_file', 'file_num', 'trial_num', 'fixation', 'area')
+
+# the columns of the data file the area can be broken down by
+LABEL_COLUMNS = ('CURRENT_FIX_INTEREST_AREA_LABEL', 'window_size', 'targetfaceplace')
+
+# the columns of the label output, one row per label and one per overlapping pair of labels
+LABEL_FIELDS = ('data_file', 'file_num', 'trial_num', 'column', 'label', 'other_label', 'area')
+
+# the most rows of gazes copied into a single shared memory block
+SHARED_BLOCK_ROWS = 1 << 16
+
+# the trials are scheduled in windows of this many trials per worker, the larger the window the closer the order
+# of the tasks comes to costliest first, at the price of holding more trials in memory
+SCHEDULE_WINDOW = 8
+
+# how often, in seconds, the parent checks that the workers are still alive while it waits on one of their queues
+WORKER_POLL_SECONDS = 1
+
+
+class ResultCollector:
+    """
+    Writes the results of a job to its output file in the order the trials were queued, whatever order the workers
+    finish them in. Results which arrive early are held back until every result before them has been written.
+    """
 
-def circle_distance(circle1: Circle, circle2: Circle):
-    return math.sqrt((circle1.center_x - circle2.center_x)**2 + (circle1.center_y - circle2.center_y)**2)
+    def __init__(self, out_file_path, output_format='text', timeline_path=None, labels_path=None):
+        """
+        out_file_path: path to the output file
+        output_format: one of OUTPUT_FORMATS
+        timeline_path: path to a csv file to write the area after each fixation to, or None
+        labels_path: path to a csv file to write the area of each label to, or None
+        """
+        self.output_format = output_format
+        self.file = open(out_file_path, 'w', newline='')
+        self.next_sequence = 0
+        self.pending = {}
+        self.csv_writer = None
+        if output_format == 'csv':
+            self.csv_writer = csv.DictWriter(self.file, RESULT_FIELDS, extrasaction='ignore')
+            self.csv_writer.writeheader()
+        self.timeline_file = None
+        self.timeline_writer = None
+        if timeline_path is not None:
+            self.timeline_file = open(timeline_path, 'w', newline='')
+            self.timeline_writer = csv.writer(self.timeline_file)
+            self.timeline_writer.writerow(TIMELINE_FIELDS)
+        self.labels_file = None
+        self.labels_writer = None
+        if labels_path is not None:
+            self.labels_file = open(labels_path, 'w', newline='')
+            self.labels_writer = csv.writer(self.labels_file)
+            self.labels_writer.writerow(LABEL_FIELDS)
+
+    def add(self, sequence, record):
+        """
+        :param sequence: the position of the trial in the job
+        :param record: the result of the trial
+        """
+        self.pending[sequence] = record
+        while self.next_sequence in self.pending:
+            self.write(self.pending.pop(self.next_sequence))
+            self.next_sequence += 1
+
+    def write(self, record):
+        if self.output_format == 'csv':
+            self.csv_writer.writerow(record)
+        elif self.output_format == 'jsonl':
+            self.file.write(json.dumps(record) + '\n')
+        else:
+            self.file.write(format_result(record))
+        if self.timeline_writer is not None:
+            for fixation, area in enumerate(record['area_timeline'], 1):
+                self.timeline_writer.writerow((record['data_file'], record['file_num'], record['trial_num'], fixation,
+                                               area))
+        if self.labels_writer is not None:
+            trial = (record['data_file'], record['file_num'], record['trial_num'])
+            for column, label_areas in record['label_areas'].items():
+                for label, area in label_areas.items():
+                    self.labels_writer.writerow(trial + (column, label, '', area))
+                for label, other_label, area in record['label_overlaps'][column]:
+                    self.labels_writer.writerow(trial + (column, label, other_label, area))
+
+    def close(self):
+        self.file.close()
+        if self.timeline_file is not None:
+            self.timeline_file.close()
+        if self.labels_file is not None:
+            self.labels_file.close()
+
+
+def side_file_path(out_file_path, kind) -> str:
+    """
+    :param out_file_path: path to the output file of a job
+    :param kind: what the side file holds, e.g. 'timeline'
+    :return: path to the csv file of that kind next to the output file
+    """
+    return "{}_{}.csv".format(os.path.splitext(out_file_path)[0], kind)
 
 
-def intersection_area(circles: List[Circle], y_min: int, y_max: int, step: float) -> float:
+def format_result(record) -> str:
     """
-    Calculates the total area of a list of overlapping circles
+    :param record: the result of a trial
+    :return: the result in the human readable text format
     """
-    def intersect(circle, y):
-        """
-        Returns the intersection points of a circle with a horizontal line y = y
-        :param circle: The circle of interest
-        :param y: the horizontal line y = y
-        :return: the x coordinates of the two intersection points as a tuple
-        """
-        dx: float = math.sqrt(circle.radius ** 2 - (y - circle.center_y) ** 2)
-        return circle.center_x - dx, circle.center_x + dx
-    
-    total: float = 0
+    # append pieces of the result to this list, which will get stitched together
+    # at the end, for performance reasons
+    # https://waymoot.org/home/python_string/
+    result_list = []
+    for x in range(3):
+        result_list.append("-----------------")
+    result_list.append("\n")
+    result_list.append("File Number: {}\n".format(record['file_num']))
+    result_list.append("Trial Number: {}\n".format(record['trial_num']))
+    result_list.append("The total area of covered by the gazes is {:2f}, based on the {} method\n".format(
+        record['area'], record['area_engine']))
+    if record['area_engine'] == 'adaptive':
+        result_list.append("({} width evaluations)\n".format(record['area_evaluations']))
+    for estimate in record['monte_carlo_rounds']:
+        result_list.append("{:.4f} +/- {:.4f} ({} samples)\n".format(*estimate))
+    return "".join(result_list)
+
+
+def trial_circles(gaze_nums, center_x, center_y, radius, labels=None) -> CircleSet:
+    """
+    :param gaze_nums: the gaze numbers of a trial's rows
+    :param center_x: the x coordinates of the rows
+    :param center_y: the y coordinates of the rows
+    :param radius: the radii of the rows
+    :param labels: the label columns of the rows, by column name, or None
+    :return: the gazes as a CircleSet in gaze_num order, whatever order the rows were in
+    """
+    if any(later < earlier for earlier, later in zip(gaze_nums, gaze_nums[1:])):
+        order = sorted(range(len(gaze_nums)), key=gaze_nums.__getitem__)
+        center_x, center_y, radius = ([column[i] for i in order] for column in (center_x, center_y, radius))
+        if labels is not None:
+            labels = {column: [values[i] for i in order] for column, values in labels.items()}
+    return CircleSet(center_x, center_y, radius, labels)
 
-    for row in range(y_min, y_max + 1):
-        print("{} rows left".format(y_max + 1 - row))
-        right_end = -math.inf
-        y_cur = step * row
 
-        for (x0, x1) in sorted(intersect(circle, y_cur)
-                               for circle in circles if abs(y_cur - circle.center_y) < circle.radius):
-            if x1 < right_end:
-                continue
-            total += x1 - max(right_end, x0)
-            right_end = x1
+def iter_trials(data_file_path, label_columns=()):
+    """
+    Reads the gazes of a data file one trial at a time. The rows of a trial are contiguous in the data file, so a
+    trial is complete as soon as a row of the next trial is read, and only one trial is held in memory.
+    :param data_file_path: path to the data file
+    :param label_columns: the names of the columns from LABEL_COLUMNS to keep as the labels of the gazes
+    :return: a generator of ((file number, trial number), CircleSet of the gazes in gaze_num order, bounding box of
+    the trial)
+    """
+    with open(data_file_path, 'r') as file:
+        csv_reader = csv.reader(file)
+        # consume the first row which contains the headers for the columns
+        header = next(csv_reader, [])
+        label_indices = {column: header.index(column) for column in label_columns}
+        trial_key = None
+        # the columns of the current trial, the circles are only built as a CircleSet once the trial is complete
+        gaze_nums, center_x, center_y, radius = [], [], [], []
+        labels = {column: [] for column in label_columns} if label_columns else None
+        for row in csv_reader:
+            row_key = (int(row[0]), int(row[1]))
+            if row_key != trial_key:
+                if radius:
+                    circles = trial_circles(gaze_nums, center_x, center_y, radius, labels)
+                    yield trial_key, circles, bounding_box(circles)
+                trial_key = row_key
+                gaze_nums, center_x, center_y, radius = [], [], [], []
+                labels = {column: [] for column in label_columns} if label_columns else None
+            gaze_nums.append(int(row[2]))
+            center_x.append(float(row[4]))
+            center_y.append(float(row[5]))
+            radius.append(float(row[6]) / 2)
+            for column, index in label_indices.items():
+                labels[column].append(row[index])
+        if radius:
+            circles = trial_circles(gaze_nums, center_x, center_y, radius, labels)
+            yield trial_key, circles, bounding_box(circles)
+
+
+def ingest_trials(data_file_path, store_root, label_columns=()):
+    """
+    Converts a data file into a columnar gaze store, with every label column the data file has, passing each trial
+    on as soon as it is written to the store
+    :param data_file_path: path to the data file
+    :param store_root: the directory holding the stores of every data file
+    :param label_columns: the names of the columns from LABEL_COLUMNS to keep as the labels of the gazes passed on
+    :return: a generator of ((file number, trial number), CircleSet of the gazes, bounding box of the trial), like
+    iter_trials
+    """
+    with open(data_file_path, 'r') as file:
+        header = next(csv.reader(file), [])
+    store_columns = [column for column in LABEL_COLUMNS if column in header]
+    os.makedirs(store_root, exist_ok=True)
+    for trial_key, circles, min_max_data in stream_store(store_directory(store_root, data_file_path), data_file_path,
+                                                         iter_trials(data_file_path, store_columns), store_columns):
+        circles.labels = {column: circles.labels[column] for column in label_columns} if label_columns else None
+        yield trial_key, circles, min_max_data
+
 
-    return total * step
+def ingest(data_file_path, store_root) -> str:
+    """
+    Converts a data file into a columnar gaze store, with every label column the data file has, unless its store is
+    already current
+    :param data_file_path: path to the data file
+    :param store_root: the directory holding the stores of every data file
+    :return: the directory of the data file's store
+    """
+    directory = store_directory(store_root, data_file_path)
+    if not is_current(directory, data_file_path):
+        for _ in ingest_trials(data_file_path, store_root):
+            pass
+    return directory
 
 
-def is_inside_circle(circles, point):
+def load_trials(data_file_path, label_columns=(), store_root=None):
     """
-    :param circles: a list of Circle objects
-    :param point: a tuple representing a 2D point, (x coordinate, y coordinate)
-    :return: True if the point is within one or more of the circles, False if otherwise
+    Reads the gazes of a data file one trial at a time, from its gaze store if there is a store root. A data file
+    whose store is missing or out of date is parsed and ingested as its trials are read, so the trials are computed
+    while the store is written, and only the first run after the data file changes parses it.
+    :param data_file_path: path to the data file
+    :param label_columns: the names of the columns from LABEL_COLUMNS to keep as the labels of the gazes
+    :param store_root: the directory holding the stores of every data file, or None to parse the data file
+    :return: a generator of ((file number, trial number), CircleSet of the gazes, bounding box of the trial)
     """
-    for circle in circles:
-        if math.sqrt(((point[0] - circle.center_x) ** 2) + ((point[1] - circle.center_y) ** 2)) < circle.radius:
-            return True
-    return False
+    if store_root is None:
+        return iter_trials(data_file_path, label_columns)
+    directory = store_directory(store_root, data_file_path)
+    if is_current(directory, data_file_path):
+        return GazeStore(directory).iter_trials(label_columns)
+    return ingest_trials(data_file_path, store_root, label_columns)
 
 
-def monte_carlo_sampling(x_min, y_min, x_max, y_max, num_trials, circles, error_tolerance):
+def read_gazes(data_file_path, label_columns=()):
     """
-    Estimates the area bound by a list of circles using Monte Carlo Sampling
-    :param x_min: the lowest x coordinate bound by the circles
-    :param y_min: the lowest y coordinate bound by the circles
-    :param x_max: the highest x coordinate bound by the circles
-    :param y_max: the highest y coordinate bound by the circles
-    :param num_trials: number of trials
-    :param circles: list of Circle objects
-    :param error_tolerance: the upper bound for 3 * standard deviation, as a percentage of the estimated area
-    :return: the estimates as a list of strings, which will then be concatenated with the scanline result
+    Reads the gazes of every trial in a data file
+    :param data_file_path: path to the data file
+    :param label_columns: the names of the columns from LABEL_COLUMNS to keep as the labels of the gazes
+    :return: the circles of each trial and the bounding box of each trial, both keyed by (file number, trial number)
     """
-    bound_box_area = (x_max - x_min) * (y_max - y_min)
+    gazes_data = {}
 
-    num_hits = 0
-    num_tries = 0
+    trial_min_max_data = {}
 
-    result_list = []
+    for trial_key, circles, min_max_data in iter_trials(data_file_path, label_columns):
+        gazes_data[trial_key] = circles
+        trial_min_max_data[trial_key] = min_max_data
 
-    while True:
-        if is_inside_circle(circles, (random.uniform(x_min, x_max), random.uniform(y_min, y_max))):
-            num_hits += 1
+    return gazes_data, trial_min_max_data
 
-        num_tries += 1
 
-        if num_tries == num_trials:
-            estimated_proportion = num_hits / num_trials
-            estimated_area = bound_box_area * estimated_proportion
-            std_dev = bound_box_area * math.sqrt(estimated_proportion * (1 - estimated_proportion) / num_trials)
+def run_batch(jobs, area_engine='scanline', monte_carlo_sampler='uniform', monte_carlo_seed=None, decompose=False,
+              num_workers=None, output_format='text', cache=None, quiet=False, metrics_path=None, timeline=False,
+              label_columns=(), label_overlaps=False, gaze_store=None, error_target=None):
+    """
+    Calculates the area of every trial of every job on a single pool of workers. Each data file is streamed once and
+    its trials are queued for every configuration a window of trials at a time; the task queue is bounded, so
+    memory is bounded by a few windows rather than by the size of the data file. The circles are copied once into
+    blocks of shared memory, a window per block, and the tasks only refer to their rows in a block.
+    Within a window the costliest tasks are queued first, so that a large trial does not start last and keep a single
+    worker busy after the others have run out of work. A trial too costly for one worker is split into bands of rows
+    which several workers scan in parallel, and the areas of its bands are added up once they have all arrived.
+    :param jobs: list of (data file path, step size, error tolerance, output file path)
+    :param area_engine: one of AREA_ENGINES
+    :param monte_carlo_sampler: one of MONTE_CARLO_SAMPLERS
+    :param monte_carlo_seed: seed for the samplers other than uniform
+    :param decompose: if True, each cluster of overlapping circles is computed separately
+    :param num_workers: the number of worker processes, by default one per CPU
+    :param output_format: one of OUTPUT_FORMATS
+    :param cache: a ResultCache, trials found in it are not computed again and new results are added to it
+    :param quiet: if True, the progress of the workers is not printed
+    :param metrics_path: path of a JSON file to write the progress of the workers to periodically
+    :param timeline: if True, the area after each fixation of every trial is also written, to a csv file next to
+    each output file
+    :param label_columns: the columns from LABEL_COLUMNS to break the area of every trial down by, the area of each
+    label is written to a csv file next to each output file
+    :param label_overlaps: if True, the overlaps between every two labels of a column are written as well
+    :param gaze_store: the directory holding the columnar gaze stores of the data files, or None to parse the data
+    files every time
+    :param error_target: the absolute error target of the adaptive engine, by default 1 / 2 ^ step size
+    """
+    if num_workers is None:
+        num_workers = default_num_workers()
+    # group the configurations of each data file, so that every data file is read once
+    file_jobs = {}
+    for job_index, (data_file_path, step_size, err_tolerance, _) in enumerate(jobs):
+        file_jobs.setdefault(data_file_path, []).append((job_index, step_size, err_tolerance))
+
+    task_queue = multiprocessing.JoinableQueue(2 * num_workers)
+    results = multiprocessing.Queue()
+
+    # the workers report their progress to a monitor thread, unless nobody would see it
+    progress_queue = None
+    monitor = None
+    if not quiet or metrics_path is not None:
+        progress_queue = multiprocessing.Queue()
+        monitor = ProgressMonitor(progress_queue, quiet, metrics_path)
+        monitor.start()
+
+    # start the resource tracker before the workers, so that they share it; a worker with a tracker of its own
+    # would unlink the shared memory blocks it attached to when it exits
+    resource_tracker.ensure_running()
+
+    workers = []
+    for i in range(num_workers):
+        workers.append(CircleWorker(task_queue, results, area_engine, monte_carlo_sampler, monte_carlo_seed,
+                                    decompose, progress_queue, timeline, label_overlaps, error_target))
+    for worker in workers:
+        worker.start()
+
+    collectors = [ResultCollector(out_file_path, output_format,
+                                  side_file_path(out_file_path, 'timeline') if timeline else None,
+                                  side_file_path(out_file_path, 'labels') if label_columns else None)
+                  for _, _, _, out_file_path in jobs]
+    job_sizes = [0] * len(jobs)
+
+    # shared memory blocks by name, with the number of tasks that still refer to each block
+    blocks = {}
+    # cache key of every queued trial, by (job index, position of the trial in the job)
+    cache_keys = {}
+    # the records of the bands of split trials that have arrived so far, by (job index, position of the trial)
+    band_records = {}
+    num_tasks = 0
+    num_results = 0
+
+    def check_workers():
+        # a worker that was killed, rather than failing a trial, neither takes its tasks nor sends their results
+        for worker in workers:
+            if worker.exitcode not in (None, 0):
+                raise RuntimeError("worker {} exited with code {}".format(worker.name, worker.exitcode))
 
-            result_str = "{:.4f} +/- {:.4f} ({} samples)\n".format(estimated_area, std_dev, num_tries)
-            print(result_str)
-            result_list.append(result_str)
-            if std_dev * 3 <= (estimated_area * error_tolerance / 100):
+    def put_task(task):
+        while True:
+            try:
+                task_queue.put(task, True, WORKER_POLL_SECONDS)
+                return
+            except queue.Full:
+                check_workers()
+
+    def next_result(block):
+        if not block:
+            return results.get(False)
+        while True:
+            try:
+                return results.get(True, WORKER_POLL_SECONDS)
+            except queue.Empty:
+                check_workers()
+
+    def write_results(block):
+        nonlocal num_results
+        job_index, sequence, block_name, band, record = next_result(block)
+        num_results += 1
+        if 'error' in record:
+            raise RuntimeError("file {} trial {} of {} failed:\n{}".format(
+                record['file_num'], record['trial_num'], record['data_file'], record['error']))
+        if band is not None:
+            records = band_records.setdefault((job_index, sequence), [None] * band[1])
+            records[band[0]] = record
+            if None in records:
+                record = None
+            else:
+                del band_records[(job_index, sequence)]
+                record = records[0]
+                record['area'] = sum(band_record['area'] for band_record in records)
+                record['area_evaluations'] = sum(band_record['area_evaluations'] for band_record in records)
+                record['area_seconds'] = sum(band_record['area_seconds'] for band_record in records)
+                for band_record in records[1:] if 'label_areas' in record else ():
+                    for column, areas in band_record['label_areas'].items():
+                        for label, area in areas.items():
+                            record['label_areas'][column][label] += area
+                    for column, column_overlaps in band_record['label_overlaps'].items():
+                        for overlap, band_overlap in zip(record['label_overlaps'][column], column_overlaps):
+                            overlap[2] += band_overlap[2]
+        if record is not None:
+            collectors[job_index].add(sequence, record)
+            cache_key = cache_keys.pop((job_index, sequence))
+            if cache_key is not None:
+                cache.put(cache_key, record)
+        blocks[block_name][1] -= 1
+        if blocks[block_name][1] == 0:
+            shared_block = blocks.pop(block_name)[0]
+            shared_block.close()
+            shared_block.unlink()
+
+    def dispatch(data_file_path, trials):
+        nonlocal num_tasks
+        # look the trials up in the cache first, only the trials with results missing are copied and queued
+        queued = []
+        for (file_num, trial_num), circles, min_max_data in trials:
+            missing = []
+            for job_index, step_size, err_tolerance in file_jobs[data_file_path]:
+                sequence = job_sizes[job_index]
+                job_sizes[job_index] += 1
+                cache_key = None
+                if cache is not None:
+                    cache_key = trial_cache_key(
+                        circles, area_engine=area_engine, step_size=step_size, error_target=error_target,
+                        decompose=decompose, monte_carlo_sampler=monte_carlo_sampler, error_tolerance=err_tolerance,
+                        timeline=timeline, labels=circles.labels, label_overlaps=label_overlaps,
+                        seed=None if monte_carlo_seed is None else [monte_carlo_seed, file_num, trial_num])
+                    record = cache.get(cache_key)
+                    if record is not None:
+                        record.update(data_file=data_file_path, file_num=file_num, trial_num=trial_num)
+                        collectors[job_index].add(sequence, record)
+                        continue
+                missing.append((job_index, sequence, step_size, err_tolerance, cache_key))
+            if missing:
+                queued.append(((file_num, trial_num), circles, min_max_data, missing))
+        if not queued:
+            return
+
+        shared_block, offsets = share_trials([circles for _, circles, _, _ in queued])
+        num_rows = sum(count for _, count in offsets)
+        tasks = []
+        for ((file_num, trial_num), circles, min_max_data, missing), (offset, count) in zip(queued, offsets):
+            for job_index, sequence, step_size, err_tolerance, cache_key in missing:
+                cache_keys[(job_index, sequence)] = cache_key
+                task = (job_index, sequence, (data_file_path, file_num, trial_num), step_size, err_tolerance,
+                        (shared_block.name, num_rows, offset, count), min_max_data)
+                labels = circles.labels
+                cost = estimate_cost(area_engine, min_max_data, count, step_size, error_target)
+                # the Monte Carlo estimate often costs more than the area, and only the first band runs it
+                sampling_cost = monte_carlo_cost(monte_carlo_sampler, min_max_data, circles.radius, err_tolerance)
+                bands = [] if decompose else plan_bands(area_engine, min_max_data, count, step_size, num_workers)
+                if not bands:
+                    tasks.append((cost + sampling_cost, task + (None, labels)))
+                for band_index, (first_row, last_row) in enumerate(bands):
+                    tasks.append((cost / len(bands) + (sampling_cost if band_index == 0 else 0.0),
+                                  task + ((band_index, len(bands), first_row, last_row), labels)))
+        # costliest first, a stable sort keeps the tasks of equal cost in the order they were read
+        tasks.sort(key=lambda cost_task: -cost_task[0])
+        blocks[shared_block.name] = [shared_block, len(tasks)]
+        for _, task in tasks:
+            put_task(task)
+            num_tasks += 1
+            if monitor is not None:
+                monitor.num_queued += 1
+        # write out whatever results are ready before reading on
+        while num_results < num_tasks:
+            try:
+                write_results(False)
+            except queue.Empty:
                 break
-            num_trials *= 2
-    return result_list
+
+    try:
+        # Enqueue tasks a window of trials at a time, so that the workers start while the data file is still being
+        # read, and the costliest trials of each window start first
+        for data_file_path in file_jobs:
+            trials = []
+            num_rows = 0
+            for trial in load_trials(data_file_path, label_columns, gaze_store):
+                trials.append(trial)
+                num_rows += len(trial[1])
+                if len(trials) >= SCHEDULE_WINDOW * num_workers or num_rows >= SHARED_BLOCK_ROWS:
+                    dispatch(data_file_path, trials)
+                    trials = []
+                    num_rows = 0
+            if trials:
+                dispatch(data_file_path, trials)
+
+        for i in range(num_workers):
+            put_task(None)  # poison pills to terminate the workers
+
+        while num_results < num_tasks:
+            write_results(True)
+    except BaseException:
+        # the workers would otherwise wait forever on a queue that nobody feeds
+        for worker in workers:
+            worker.terminate()
+        raise
+    finally:
+        for collector in collectors:
+            collector.close()
+        for shared_block, _ in blocks.values():
+            shared_block.close()
+            shared_block.unlink()
+        if monitor is not None:
+            monitor.stop()
+
+    task_queue.join()
 
 
 def main():
@@ -168,124 +694,141 @@ def main():
                     "a percentage of the estimated area\n"))
 
     step_size = int(input("The step size for the scanline method will be 1 / 2 ^ n, how big should n be?\n"))
-    gazes_data = {}
-
-    trial_min_max_data = {}
+    area_engine = input("Which engine should calculate the area, scanline, sweep, vectorized, adaptive or exact? "
+                        "(default: scanline)\n").strip().lower()
+    if area_engine not in AREA_ENGINES:
+        area_engine = 'scanline'
+    error_target = None
+    if area_engine == 'adaptive':
+        target_str = input("Please enter the absolute error target of the adaptive engine, or leave blank for "
+                           "1 / 2 ^ n\n").strip()
+        error_target = float(target_str) if target_str else None
+    monte_carlo_sampler = input("Which Monte Carlo sampler should be used, uniform, vectorized, stratified, halton or "
+                                "importance? (default: uniform)\n").strip().lower()
+    if monte_carlo_sampler not in MONTE_CARLO_SAMPLERS:
+        monte_carlo_sampler = 'uniform'
+    seed_str = input("Please enter a seed for the sampler, or leave blank for a random seed (the uniform sampler "
+                     "ignores it)\n").strip()
+    monte_carlo_seed = int(seed_str) if seed_str else None
+    decompose = input("Should each cluster of overlapping gazes be computed separately? "
+                      "(y/n, default: n)\n").strip().lower().startswith('y')
 
     data_file_path = os.path.abspath(input("Please enter the path to the data file\n"))
     out_file_path = os.path.abspath(input("Please enter the path to the desired output file\n"))
 
-    curr_trial_num = 1
-    trial_num = 1
-
-    file_num = 0
-    curr_file_num = 0
-
-    y_min = math.inf
-    y_max = -math.inf
+    run_batch([(data_file_path, step_size, monte_carlo_error_tolerance, out_file_path)], area_engine,
+              monte_carlo_sampler, monte_carlo_seed, decompose, error_target=error_target)
 
-    x_min = math.inf
-    x_max = -math.inf
 
-    with open(data_file_path, 'r') as file:
-        csv_reader = csv.reader(file)
-        row_num = 0
-        for row in csv_reader:
-            # consume the first row which contains the headers for the columns
-            if row_num == 0:
-                row_num += 1
-                continue
-
-            trial_num = int(row[1])
-            file_num = int(row[0])
-            if (curr_file_num, curr_trial_num) != (file_num, trial_num):
-                trial_min_max_data[(curr_file_num, curr_trial_num)] = {}
-                trial_min_max_data[(curr_file_num, curr_trial_num)]['x_min'] = x_min
-                trial_min_max_data[(curr_file_num, curr_trial_num)]['x_max'] = x_max
-                trial_min_max_data[(curr_file_num, curr_trial_num)]['y_min'] = y_min
-                trial_min_max_data[(curr_file_num, curr_trial_num)]['y_max'] = y_max
-
-                curr_trial_num = trial_num
-                curr_file_num = file_num
-
-                y_min = math.inf
-                y_max = -math.inf
-
-                x_min = math.inf
-                x_max = -math.inf
-
-            center_x = float(row[4])
-            center_y = float(row[5])
-            radius = float(row[6]) / 2
-
-            if (file_num, trial_num) not in gazes_data:
-                gazes_data[(curr_file_num, curr_trial_num)] = []
-            gazes_data[(curr_file_num, curr_trial_num)].append(Circle(center_x, center_y, radius))
-
-            y_min = min(y_min, center_y - radius)
-            y_max = max(y_max, center_y + radius)
-
-            x_min = min(x_min, center_x - radius)
-            x_max = max(x_max, center_x + radius)
-
-    # add the data for the last trial number
-    trial_min_max_data[(file_num, trial_num)] = {}
-    trial_min_max_data[(file_num, trial_num)]['x_min'] = x_min
-    trial_min_max_data[(file_num, trial_num)]['x_max'] = x_max
-    trial_min_max_data[(file_num, trial_num)]['y_min'] = y_min
-    trial_min_max_data[(file_num, trial_num)]['y_max'] = y_max
-
-    with open(out_file_path, 'w') as output_file:
-
-        # for (file_num, trial_num) in gazes_data:
-        #
-        #     print('file num: ' + str(file_num))
-        #     print('trial ' + str(trial_num))
-        #     for x in range(3):
-        #         output_file.write("-----------------")
-        #     print('\n')
-        #     min_max_data = trial_min_max_data[(file_num, trial_num)]
-        #     # Adjust the step size up or down if less or more precision is desired, respectively
-        #     step: float = 1 / (1 << step_size)
-        #     y_min_step = int(math.floor(min_max_data['y_min'] / step))
-        #     y_max_step = int(math.ceil(min_max_data['y_max'] / step))
-        #     area: float = intersection_area(gazes_data[(file_num, trial_num)], y_min_step, y_max_step, step)
-        #     output_file.write("File Number: " + str(file_num) + '\n')
-        #     output_file.write("Trial Number: " + str(trial_num) + '\n')
-        #     scanline_result_str = \
-        #         "The total area of covered by the gazes is {:2f}, based on the scanline method\n".format(area)
-        #     print(scanline_result_str)
-        #     output_file.write(scanline_result_str)
-        #     monte_carlo_sampling(min_max_data['x_min'], min_max_data['y_min'],
-        #                          min_max_data['x_max'], min_max_data['y_max'],
-        #                          65536, gazes_data[(file_num, trial_num)], output_file, monte_carlo_error_tolerance)
-        task_queue = multiprocessing.JoinableQueue()
-        results = multiprocessing.Queue()
-
-        workers = []
-        for i in range(4):
-            workers.append(CircleWorker(task_queue, results, trial_min_max_data, gazes_data,
-                                        step_size, monte_carlo_error_tolerance))
-        for worker in workers:
-            worker.start()
-
-        # Enqueue tasks
-        for task in gazes_data:
-            task_queue.put(task)
-
-        for i in range(4):
-            task_queue.put(None)  # poison pills to terminate the 4 workers
+def parse_config(config_str):
+    """
+    Parses a STEP_SIZE:TOLERANCE command line configuration
+    :param config_str: e.g. "6:0.5" for a scanline step of 1 / 2 ^ 6 and a 0.5% Monte Carlo tolerance
+    :return: the tuple (step size, error tolerance)
+    """
+    try:
+        step_size, err_tolerance = config_str.split(':')
+        return int(step_size), float(err_tolerance)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected STEP_SIZE:TOLERANCE, e.g. 6:0.5, got '{}'".format(config_str))
 
-        task_queue.join()
 
-        while not results.empty():
-            result = results.get()
-            output_file.write(result)
+def batch_main(argv=None):
+    """
+    Non-interactive entry point, runs every data file with every configuration on one pool of workers
+    """
+    parser = argparse.ArgumentParser(description="Calculates the area covered by the gazes of each trial")
+    parser.add_argument('data_files', nargs='+', help="paths to the data files")
+    parser.add_argument('-c', '--config', dest='configs', type=parse_config, action='append',
+                        metavar='STEP_SIZE:TOLERANCE',
+                        help="the scanline step will be 1 / 2 ^ STEP_SIZE (the absolute error target of the adaptive "
+                             "engine, unless --error-target is given) and the Monte Carlo standard deviation is "
+                             "tolerated up to TOLERANCE percent of the estimated area, may be repeated")
+    parser.add_argument('-o', '--output-dir', default='.', help="directory to write the output files to")
+    parser.add_argument('--engine', choices=AREA_ENGINES, default='scanline', help="the engine to calculate the area")
+    parser.add_argument('--error-target', type=float, default=None, metavar='TARGET',
+                        help="the absolute error target of the adaptive engine, any positive number (default: "
+                             "1 / 2 ^ STEP_SIZE)")
+    parser.add_argument('--sampler', choices=MONTE_CARLO_SAMPLERS, default='uniform',
+                        help="the Monte Carlo sampler")
+    parser.add_argument('--seed', type=int, default=None, help="seed for the samplers other than uniform")
+    parser.add_argument('--decompose', action='store_true',
+                        help="compute each cluster of overlapping gazes separately")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="the number of worker processes (default: one per CPU)")
+    parser.add_argument('-f', '--format', choices=OUTPUT_FORMATS, default='text', help="the format of the output files")
+    parser.add_argument('--cache-dir', default='.area_cache', help="directory of the cache of trial results")
+    parser.add_argument('--cache-size', type=int, default=256, help="the most megabytes the cache may take up")
+    parser.add_argument('--no-cache', action='store_true', help="compute every trial, without reading or writing "
+                                                                "the cache")
+    parser.add_argument('--clear-cache', action='store_true', help="empty the cache before running")
+    parser.add_argument('-q', '--quiet', action='store_true', help="do not print the progress of the workers")
+    parser.add_argument('--timeline', action='store_true',
+                        help="also write the area after each fixation of every trial, in gaze_num order, to a "
+                             "_timeline.csv file next to each output file")
+    parser.add_argument('--labels', nargs='+', choices=LABEL_COLUMNS, default=(), metavar='COLUMN',
+                        help="also write the area covered by the gazes of each label of these columns ({}) to a "
+                             "_labels.csv file next to each output file".format(", ".join(LABEL_COLUMNS)))
+    parser.add_argument('--overlaps', action='store_true',
+                        help="with --labels, also write the overlap between every two labels of a column")
+    parser.add_argument('--gaze-store', default='.gaze_store',
+                        help="directory of the binary columnar copies of the data files, which are read instead of "
+                             "parsing the data files once made")
+    parser.add_argument('--no-gaze-store', action='store_true', help="parse the data files every time")
+    parser.add_argument('--ingest', action='store_true',
+                        help="only convert the data files into the gaze store, without calculating anything")
+    parser.add_argument('--metrics', default=None, metavar='PATH',
+                        help="write the progress of the workers to this JSON file periodically")
+    args = parser.parse_args(argv)
+
+    gaze_store = None if args.no_gaze_store else args.gaze_store
+    if args.ingest:
+        if gaze_store is None:
+            parser.error("--ingest needs the gaze store")
+        for data_file in args.data_files:
+            print("{} -> {}".format(data_file, ingest(os.path.abspath(data_file), gaze_store)))
+        return
+    if not args.configs:
+        parser.error("the following arguments are required: -c/--config")
+    if args.error_target is not None and not args.error_target > 0:
+        parser.error("--error-target must be positive")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    data_file_paths = [os.path.abspath(data_file) for data_file in args.data_files]
+    stems = [os.path.splitext(os.path.basename(data_file_path))[0] for data_file_path in data_file_paths]
+    # data files of the same name in different directories are told apart by the name of their directory
+    stem_counts = Counter(stems)
+    jobs = []
+    for data_file_path, stem in zip(data_file_paths, stems):
+        if stem_counts[stem] > 1:
+            stem = "{}_{}".format(os.path.basename(os.path.dirname(data_file_path)), stem)
+        for step_size, err_tolerance in args.configs:
+            out_file_path = os.path.join(os.path.abspath(args.output_dir),
+                                         "{}_n{}_tol{}.{}".format(stem, step_size, err_tolerance,
+                                                                  OUTPUT_EXTENSIONS[args.format]))
+            jobs.append((data_file_path, step_size, err_tolerance, out_file_path))
+    out_file_counts = Counter(out_file_path for _, _, _, out_file_path in jobs)
+    clashes = sorted(out_file_path for out_file_path, count in out_file_counts.items() if count > 1)
+    if clashes:
+        parser.error("more than one run would write to {}, give each data file and configuration once, and data "
+                     "files of the same name from directories of different names".format(", ".join(clashes)))
+
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache(args.cache_dir, args.cache_size << 20)
+        if args.clear_cache:
+            cache.clear()
+
+    run_batch(jobs, args.engine, args.sampler, args.seed, args.decompose, args.workers, args.format, cache,
+              args.quiet, args.metrics, args.timeline, args.labels, args.overlaps, gaze_store, args.error_target)
 
 
 if __name__ == "__main__":
     start_time = process_time()
-    main()
+    if len(sys.argv) > 1:
+        batch_main()
+    else:
+        main()
     end_time = process_time()
     total_time = end_time - start_time
     print("Process took {} minutes and {} seconds of CPU time to complete".format(total_time // 60, total_time % 60))
@@ -1,116 +1,10 @@
-from typing import List
 import math
-import random
 import os
 import csv
+from progress import ProgressReporter, console_sink
 from time import process_time
-
-
-class Circle:
-    """
-    Represents a circle
-    """
-
-    def __init__(self, center_x: float, center_y: float, radius: float):
-        """
-        center_x: x coordinate of center
-        center_y: y coordinate of center
-        radius: radius of circle
-        """
-        self.center_x = center_x
-        self.center_y = center_y
-        self.radius = radius
-        self.y_low = center_y - radius
-        self.y_high = center_y + radius
-        self.x_0: float = 0.0  # the left intersection point of this circle with the scan line
-        self.x_1: float = 0.0  # the right intersection point of this circle with the scan line
-
-    def __eq__(self, other):
-        return self.center_x == other.center_x and self.center_y == other.center_y and self.radius == other.radius
-
-
-def circle_distance(circle1: Circle, circle2: Circle):
-    return math.sqrt((circle1.center_x - circle2.center_x)**2 + (circle1.center_y - circle2.center_y)**2)
-
-
-def intersection_area(circles: List[Circle], y_min: int, y_max: int, step: float) -> float:
-    """
-    Calculates the total area of a list of overlapping circles
-    """
-    def intersect(circle, y):
-        """
-        Returns the intersection points of a circle with a horizontal line y = y
-        :param circle: The circle of interest
-        :param y: the horizontal line y = y
-        :return: the x coordinates of the two intersection points as a tuple
-        """
-        dx: float = math.sqrt(circle.radius ** 2 - (y - circle.center_y) ** 2)
-        return circle.center_x - dx, circle.center_x + dx
-    
-    total: float = 0
-
-    for row in range(y_min, y_max + 1):
-        print("{} rows left".format(y_max + 1 - row))
-        right_end = -math.inf
-        y_cur = step * row
-
-        for (x0, x1) in sorted(intersect(circle, y_cur)
-                               for circle in circles if abs(y_cur - circle.center_y) < circle.radius):
-            if x1 < right_end:
-                continue
-            total += x1 - max(right_end, x0)
-            right_end = x1
-
-    return total * step
-
-
-def is_inside_circle(circles, point):
-    """
-    :param circles: a list of Circle objects
-    :param point: a tuple representing a 2D point, (x coordinate, y coordinate)
-    :return: True if the point is within one or more of the circles, False if otherwise
-    """
-    for circle in circles:
-        if math.sqrt(((point[0] - circle.center_x) ** 2) + ((point[1] - circle.center_y) ** 2)) < circle.radius:
-            return True
-    return False
-
-
-def monte_carlo_sampling(x_min, y_min, x_max, y_max, num_trials, circles, output_file, error_tolerance):
-    """
-    Estimates the area bound by a list of circles using Monte Carlo Sampling
-    :param x_min: the lowest x coordinate bound by the circles
-    :param y_min: the lowest y coordinate bound by the circles
-    :param x_max: the highest x coordinate bound by the circles
-    :param y_max: the highest y coordinate bound by the circles
-    :param num_trials: number of trials
-    :param circles: list of Circle objects
-    :param output_file: the output file to write the calculated data to
-    :param error_tolerance: the upper bound for 3 * standard deviation, as a percentage of the estimated area
-    :return: estimated area, standard deviation of the estimated area
-    """
-    bound_box_area = (x_max - x_min) * (y_max - y_min)
-
-    num_hits = 0
-    num_tries = 0
-
-    while True:
-        if is_inside_circle(circles, (random.uniform(x_min, x_max), random.uniform(y_min, y_max))):
-            num_hits += 1
-
-        num_tries += 1
-
-        if num_tries == num_trials:
-            estimated_proportion = num_hits / num_trials
-            estimated_area = bound_box_area * estimated_proportion
-            std_dev = bound_box_area * math.sqrt(estimated_proportion * (1 - estimated_proportion) / num_trials)
-
-            result_str = "{:.4f} +/- {:.4f} ({} samples)\n".format(estimated_area, std_dev, num_tries)
-            print(result_str)
-            output_file.write(result_str)
-            if std_dev * 3 <= (estimated_area * error_tolerance / 100):
-                break
-            num_trials *= 2
+from circles import CircleSet
+from area_engines import AREA_ENGINES, MONTE_CARLO_SAMPLERS, trial_area, trial_monte_carlo
 
 
 def main():
@@ -120,6 +14,24 @@ def main():
                     "a percentage of the estimated area\n"))
 
     step_size = int(input("The step size for the scanline method will be 1 / 2 ^ n, how big should n be?\n"))
+    area_engine = input("Which engine should calculate the area, scanline, sweep, vectorized, adaptive or exact? "
+                        "(default: scanline)\n").strip().lower()
+    if area_engine not in AREA_ENGINES:
+        area_engine = 'scanline'
+    error_target = None
+    if area_engine == 'adaptive':
+        target_str = input("Please enter the absolute error target of the adaptive engine, or leave blank for "
+                           "1 / 2 ^ n\n").strip()
+        error_target = float(target_str) if target_str else None
+    monte_carlo_sampler = input("Which Monte Carlo sampler should be used, uniform, vectorized, stratified, halton or "
+                                "importance? (default: uniform)\n").strip().lower()
+    if monte_carlo_sampler not in MONTE_CARLO_SAMPLERS:
+        monte_carlo_sampler = 'uniform'
+    seed_str = input("Please enter a seed for the sampler, or leave blank for a random seed (the uniform sampler "
+                     "ignores it)\n").strip()
+    monte_carlo_seed = int(seed_str) if seed_str else None
+    decompose = input("Should each cluster of overlapping gazes be computed separately? "
+                      "(y/n, default: n)\n").strip().lower().startswith('y')
     gazes_data = {}
 
     trial_min_max_data = {}
@@ -172,7 +84,7 @@ def main():
 
             if (file_num, trial_num) not in gazes_data:
                 gazes_data[(curr_file_num, curr_trial_num)] = []
-            gazes_data[(curr_file_num, curr_trial_num)].append(Circle(center_x, center_y, radius))
+            gazes_data[(curr_file_num, curr_trial_num)].append((center_x, center_y, radius))
 
             y_min = min(y_min, center_y - radius)
             y_max = max(y_max, center_y + radius)
@@ -186,6 +98,8 @@ def main():
     trial_min_max_data[(file_num, trial_num)]['x_max'] = x_max
     trial_min_max_data[(file_num, trial_num)]['y_min'] = y_min
     trial_min_max_data[(file_num, trial_num)]['y_max'] = y_max
+    # store each trial's gazes as columns rather than as one object per gaze
+    gazes_data = {trial_key: CircleSet(*zip(*rows)) for trial_key, rows in gazes_data.items()}
 
     with open(out_file_path, 'w') as output_file:
         for (file_num, trial_num) in gazes_data:
@@ -196,20 +110,25 @@ def main():
                 output_file.write("-----------------")
             print('\n')
             min_max_data = trial_min_max_data[(file_num, trial_num)]
-            # Adjust the step size up or down if less or more precision is desired, respectively
-            step: float = 1 / (1 << step_size)
-            y_min_step = int(math.floor(min_max_data['y_min'] / step))
-            y_max_step = int(math.ceil(min_max_data['y_max'] / step))
-            area: float = intersection_area(gazes_data[(file_num, trial_num)], y_min_step, y_max_step, step)
+            progress = ProgressReporter(console_sink, "file {} trial {}".format(file_num, trial_num))
+            area, num_evaluations = trial_area(area_engine, gazes_data[(file_num, trial_num)], min_max_data,
+                                               step_size, decompose, progress, error_target=error_target)
             output_file.write("File Number: " + str(file_num) + '\n')
             output_file.write("Trial Number: " + str(trial_num) + '\n')
             scanline_result_str = \
-                "The total area of covered by the gazes is {:2f}, based on the scanline method\n".format(area)
+                "The total area of covered by the gazes is {:2f}, based on the {} method\n".format(area, area_engine)
+            if area_engine == 'adaptive':
+                scanline_result_str += "({} width evaluations)\n".format(num_evaluations)
             print(scanline_result_str)
             output_file.write(scanline_result_str)
-            monte_carlo_sampling(min_max_data['x_min'], min_max_data['y_min'],
-                                 min_max_data['x_max'], min_max_data['y_max'],
-                                 65536, gazes_data[(file_num, trial_num)], output_file, monte_carlo_error_tolerance)
+            # seed each trial from its key, so a trial's estimate does not depend on the order trials are run in
+            estimates = trial_monte_carlo(monte_carlo_sampler, gazes_data[(file_num, trial_num)], min_max_data,
+                                          monte_carlo_error_tolerance,
+                                          None if monte_carlo_seed is None else (monte_carlo_seed, file_num, trial_num),
+                                          decompose, progress)
+            for estimate in estimates:
+                result_str = "{:.4f} +/- {:.4f} ({} samples)\n".format(*estimate)
+                output_file.write(result_str)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,1170 @@
+from typing import List, Optional, Tuple
+import math
+import random
+import numpy as np
+from circles import CircleSet, circle_tuples
+from scheduler import MONTE_CARLO_FIRST_ROUND, trial_rows
+
+
+TWO_PI = 2 * math.pi
+
+# upper bound on the number of (row, circle) pairs the vectorized scanline holds in memory at once
+BLOCK_ELEMENTS = 1 << 20
+
+# the row by row engines report their progress once every this many rows, a report per row costs a quarter of a sweep
+PROGRESS_ROWS = 1024
+
+
+def circle_distance(circle1, circle2):
+    return math.sqrt((circle1.center_x - circle2.center_x)**2 + (circle1.center_y - circle2.center_y)**2)
+
+
+def _covered_arc(circle, other) -> Optional[Tuple[float, float]]:
+    """
+    Returns the angular interval of circle's boundary which lies inside other
+    :param circle: the circle whose boundary is being examined
+    :param other: the circle that may cover part of that boundary
+    :return: (start angle, end angle) in radians, or None if the boundaries do not cross
+    """
+    dx = other.center_x - circle.center_x
+    dy = other.center_y - circle.center_y
+    d = math.hypot(dx, dy)
+    if d >= circle.radius + other.radius or d + other.radius <= circle.radius:
+        return None
+    cos_alpha = (circle.radius ** 2 + d ** 2 - other.radius ** 2) / (2 * circle.radius * d)
+    alpha = math.acos(max(-1.0, min(1.0, cos_alpha)))
+    phi = math.atan2(dy, dx)
+    return phi - alpha, phi + alpha
+
+
+def _is_covered(circle, other) -> bool:
+    """
+    :return: True if circle lies entirely within other
+    """
+    d = math.hypot(other.center_x - circle.center_x, other.center_y - circle.center_y)
+    return d + circle.radius <= other.radius
+
+
+def _uncovered_arcs(intervals: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """
+    Returns the complement in [0, 2 pi) of a list of angular intervals
+    :param intervals: (start, end) angles, which may extend outside [0, 2 pi)
+    :return: the angular intervals of the boundary which are not covered
+    """
+    normalized = []
+    for start, end in intervals:
+        width = end - start
+        start %= TWO_PI
+        end = start + width
+        if end > TWO_PI:
+            normalized.append((start, TWO_PI))
+            normalized.append((0.0, end - TWO_PI))
+        else:
+            normalized.append((start, end))
+
+    arcs = []
+    right_end = 0.0
+    for start, end in sorted(normalized):
+        if start > right_end:
+            arcs.append((right_end, start))
+        right_end = max(right_end, end)
+    if right_end < TWO_PI:
+        arcs.append((right_end, TWO_PI))
+    return arcs
+
+
+def _boundary_integral(circle, covered: List[Tuple[float, float]]) -> float:
+    """
+    Returns twice the line integral 1/2 * (x dy - y dx) over the arcs of a circle's boundary which are not covered
+    :param circle: the circle whose boundary is being integrated
+    :param covered: the angular intervals of the boundary which lie inside other circles
+    """
+    total: float = 0
+    r = circle.radius
+    for a, b in _uncovered_arcs(covered):
+        total += r * r * (b - a) \
+            + r * circle.center_x * (math.sin(b) - math.sin(a)) \
+            - r * circle.center_y * (math.cos(b) - math.cos(a))
+    return total
+
+
+def exact_area(circles) -> float:
+    """
+    Calculates the exact area of the union of a list of circles.
+
+    Applies Green's theorem to the boundary of the union: each circle contributes the arcs of its
+    boundary that are not inside any other circle, and the line integral 1/2 * (x dy - y dx) over those
+    arcs has a closed form. The cost depends only on the number of circles, not on any step size.
+    :param circles: a list of Circle objects
+    :return: the area covered by the circles
+    """
+    # drop degenerate circles, duplicates, and circles that sit entirely inside another one
+    candidates = [circle for circle in circles if circle.radius > 0]
+    boundary = []
+    for i, circle in enumerate(candidates):
+        hidden = False
+        for j, other in enumerate(candidates):
+            if i == j:
+                continue
+            if circle == other:
+                if j < i:
+                    hidden = True
+                    break
+                continue
+            if _is_covered(circle, other):
+                hidden = True
+                break
+        if not hidden:
+            boundary.append(circle)
+
+    total: float = 0
+    for circle in boundary:
+        covered = []
+        for other in boundary:
+            if other is circle:
+                continue
+            arc = _covered_arc(circle, other)
+            if arc is not None:
+                covered.append(arc)
+        total += _boundary_integral(circle, covered)
+
+    return total / 2
+
+
+class IncrementalUnion:
+    """
+    The exact area of a union of circles which are added one at a time, computed as in exact_area. Every circle keeps
+    the arcs of its boundary which the others cover and its share of the boundary integral, so adding a circle only
+    updates the circles it overlaps. Each circle is filed in the grid cell holding its center; the cells are at least
+    as wide as the largest diameter so far, so circles which overlap lie in the same or neighbouring cells. When a
+    larger circle arrives the cells are widened and the circles filed again, which keeps one cell per circle however
+    the radii vary.
+    """
+
+    def __init__(self, cell_size: float = None):
+        """
+        cell_size: the starting side length of a grid cell, defaults to the diameter of the first circle added
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        # the circles on the boundary of the union so far; circles hidden when they were added are not kept
+        self.circles = []
+        self.covered = []
+        self.integrals = []
+        self.total: float = 0
+
+    @property
+    def area(self) -> float:
+        return self.total / 2
+
+    def _cell(self, circle):
+        return math.floor(circle.center_x / self.cell_size), math.floor(circle.center_y / self.cell_size)
+
+    def _widen(self, radius):
+        """
+        Widens the cells to at least the diameter of a new circle, at least doubling them so that the circles are
+        filed again only a few times, and files the circles again
+        """
+        self.cell_size = max(2 * self.cell_size, 2 * radius)
+        self.cells = {}
+        for j, circle in enumerate(self.circles):
+            self.cells.setdefault(self._cell(circle), []).append(j)
+
+    def add(self, circle) -> float:
+        """
+        :param circle: the Circle to add
+        :return: the area of the union including the new circle
+        """
+        if circle.radius <= 0:
+            return self.area
+        if self.cell_size is None:
+            self.cell_size = 2 * circle.radius
+        elif 2 * circle.radius > self.cell_size:
+            self._widen(circle.radius)
+        col, row = self._cell(circle)
+        neighbours = sorted(j for neighbour_col in (col - 1, col, col + 1) for neighbour_row in (row - 1, row, row + 1)
+                            for j in self.cells.get((neighbour_col, neighbour_row), ()))
+
+        # a circle inside another one, or a duplicate of one, adds nothing and covers nothing new
+        if any(_is_covered(circle, self.circles[j]) for j in neighbours):
+            return self.area
+
+        covered = []
+        for j in neighbours:
+            other = self.circles[j]
+            if _is_covered(other, circle):
+                arc = (0.0, TWO_PI)
+            else:
+                arc = _covered_arc(other, circle)
+                own_arc = _covered_arc(circle, other)
+                if own_arc is not None:
+                    covered.append(own_arc)
+            if arc is not None:
+                self.covered[j].append(arc)
+                integral = _boundary_integral(other, self.covered[j])
+                self.total += integral - self.integrals[j]
+                self.integrals[j] = integral
+
+        integral = _boundary_integral(circle, covered)
+        self.total += integral
+        self.cells.setdefault((col, row), []).append(len(self.circles))
+        self.circles.append(circle)
+        self.covered.append(covered)
+        self.integrals.append(integral)
+        return self.area
+
+
+def area_timeline(circles) -> List[float]:
+    """
+    Returns how the area covered by a trial's gazes grows as its fixations are added in order
+    :param circles: a list of Circle objects or a CircleSet, in the order of the fixations
+    :return: the area of the union of the first k circles, for every k from 1 to the number of circles
+    """
+    union = IncrementalUnion()
+    return [union.add(circle) for circle in circles]
+
+
+def circle_arrays(circles) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :param circles: a list of Circle objects or a CircleSet
+    :return: the x coordinates of the centers, the y coordinates of the centers and the radii as arrays
+    """
+    if isinstance(circles, CircleSet):
+        return circles.center_x, circles.center_y, circles.radius
+    center_x = np.fromiter((circle.center_x for circle in circles), dtype=np.float64, count=len(circles))
+    center_y = np.fromiter((circle.center_y for circle in circles), dtype=np.float64, count=len(circles))
+    radius = np.fromiter((circle.radius for circle in circles), dtype=np.float64, count=len(circles))
+    return center_x, center_y, radius
+
+
+def intersection_area(circles, y_min: int, y_max: int, step: float, progress=None) -> float:
+    """
+    Calculates the total area of a list of overlapping circles
+    :param circles: a list of Circle objects or a CircleSet
+    :param progress: a ProgressReporter to report the rows processed to
+    """
+    def intersect(center_x, center_y, radius, y):
+        """
+        Returns the intersection points of a circle with a horizontal line y = y
+        :param center_x: x coordinate of the center of the circle of interest
+        :param center_y: y coordinate of the center of the circle of interest
+        :param radius: radius of the circle of interest
+        :param y: the horizontal line y = y
+        :return: the x coordinates of the two intersection points as a tuple
+        """
+        dx: float = math.sqrt(radius ** 2 - (y - center_y) ** 2)
+        return center_x - dx, center_x + dx
+
+    gazes = circle_tuples(circles)
+    
+    total: float = 0
+
+    for row in range(y_min, y_max + 1):
+        if progress is not None and (row - y_min) % PROGRESS_ROWS == 0:
+            progress.update('rows', row - y_min, y_max + 1 - y_min)
+        right_end = -math.inf
+        y_cur = step * row
+
+        for (x0, x1) in sorted(intersect(center_x, center_y, radius, y_cur)
+                               for center_x, center_y, radius in gazes if abs(y_cur - center_y) < radius):
+            if x1 < right_end:
+                continue
+            total += x1 - max(right_end, x0)
+            right_end = x1
+
+    return total * step
+
+
+def vectorized_intersection_area(circles, y_min: int, y_max: int, step: float, progress=None) -> float:
+    """
+    Calculates the total area of a list of overlapping circles with the same scanline as intersection_area,
+    but computes the chords of a block of rows at once and merges them with array operations
+    :param circles: a list of Circle objects
+    :param y_min: the index of the first row, the row is at y = y_min * step
+    :param y_max: the index of the last row, the row is at y = y_max * step
+    :param step: the distance between two rows
+    :param progress: a ProgressReporter to report the rows processed to
+    :return: the area covered by the circles
+    """
+    if not circles or y_max < y_min:
+        return 0.0
+    center_x, center_y, radius = circle_arrays(circles)
+    block_rows = max(1, BLOCK_ELEMENTS // len(circles))
+
+    total: float = 0
+    for block_start in range(y_min, y_max + 1, block_rows):
+        rows = np.arange(block_start, min(block_start + block_rows, y_max + 1), dtype=np.float64)
+        dy = rows[:, None] * step - center_y[None, :]
+        crosses = np.abs(dy) < radius
+        dx = np.sqrt(np.where(crosses, radius ** 2 - dy ** 2, 0.0))
+        # circles that miss a row become zero length chords at their center, which never add to the union
+        x0 = center_x - dx
+        x1 = center_x + dx
+
+        order = np.argsort(x0, axis=1, kind='stable')
+        x0 = np.take_along_axis(x0, order, axis=1)
+        x1 = np.take_along_axis(x1, order, axis=1)
+        right_end = np.maximum.accumulate(x1, axis=1)
+        right_end = np.concatenate((np.full((len(rows), 1), -np.inf), right_end[:, :-1]), axis=1)
+        total += float(np.maximum(x1 - np.maximum(x0, right_end), 0.0).sum())
+        if progress is not None:
+            progress.update('rows', block_start + len(rows) - y_min, y_max + 1 - y_min)
+
+    return total * step
+
+
+def sweep_intersection_area(circles, y_min: int, y_max: int, step: float, progress=None) -> float:
+    """
+    Calculates the total area of a list of overlapping circles with the same scanline as intersection_area, but
+    sweeps the rows upwards while keeping an active set of circles, so that each row only touches the circles
+    which cross it. Circles enter the active set in order of y_low and leave once the sweep has passed y_high.
+    :param circles: a list of Circle objects
+    :param y_min: the index of the first row, the row is at y = y_min * step
+    :param y_max: the index of the last row, the row is at y = y_max * step
+    :param step: the distance between two rows
+    :param progress: a ProgressReporter to report the rows processed to
+    :return: the area covered by the circles
+    """
+    pending = sorted(circles, key=lambda circle: circle.y_low)
+    next_circle = 0
+    active = []
+
+    total: float = 0
+
+    for row in range(y_min, y_max + 1):
+        if progress is not None and (row - y_min) % PROGRESS_ROWS == 0:
+            progress.update('rows', row - y_min, y_max + 1 - y_min)
+        y_cur = step * row
+        while next_circle < len(pending) and pending[next_circle].y_low <= y_cur:
+            active.append(pending[next_circle])
+            next_circle += 1
+        if not active:
+            continue
+        active = [circle for circle in active if circle.y_high >= y_cur]
+
+        right_end = -math.inf
+        chords = []
+        for circle in active:
+            dy = y_cur - circle.center_y
+            if abs(dy) < circle.radius:
+                dx = math.sqrt(circle.radius ** 2 - dy ** 2)
+                chords.append((circle.center_x - dx, circle.center_x + dx))
+        chords.sort()
+        for (x0, x1) in chords:
+            if x1 < right_end:
+                continue
+            total += x1 - max(right_end, x0)
+            right_end = x1
+
+    return total * step
+
+
+def grouped_sweep_area(circles, memberships: List[List[int]], num_groups: int, y_min: int, y_max: int, step: float,
+                       pairs: List[Tuple[int, int]] = (), progress=None) -> Tuple[float, List[float], List[float]]:
+    """
+    Calculates, in one sweep, the area of the union of all the circles, the area of the union of each group of
+    circles and the area where two groups overlap. The rows and their chords are computed once, as in
+    sweep_intersection_area, and each row's sorted chords are merged into every union at the same time.
+    :param circles: a list of Circle objects or a CircleSet
+    :param memberships: for every circle, the indices of the groups it belongs to
+    :param num_groups: the number of groups
+    :param y_min: the index of the first row, the row is at y = y_min * step
+    :param y_max: the index of the last row, the row is at y = y_max * step
+    :param step: the distance between two rows
+    :param pairs: the (group, group) index pairs whose overlaps are wanted
+    :param progress: a ProgressReporter to report the rows processed to
+    :return: the area covered by all the circles, the area covered by each group, and the overlap of each pair
+    """
+    # the unions of every pair are merged alongside the groups, the overlap is then |A| + |B| - |A u B|
+    pairs_of_group = [[] for _ in range(num_groups)]
+    for k, (group, other_group) in enumerate(pairs):
+        pairs_of_group[group].append(k)
+        pairs_of_group[other_group].append(k)
+
+    gazes = circle_tuples(circles)
+    y_lows = [center_y - radius for _, center_y, radius in gazes]
+    y_highs = [center_y + radius for _, center_y, radius in gazes]
+    order = sorted(range(len(gazes)), key=y_lows.__getitem__)
+    next_circle = 0
+    active = []
+
+    total: float = 0
+    group_totals = [0.0] * num_groups
+    pair_totals = [0.0] * len(pairs)
+
+    for row in range(y_min, y_max + 1):
+        if progress is not None and (row - y_min) % PROGRESS_ROWS == 0:
+            progress.update('rows', row - y_min, y_max + 1 - y_min)
+        y_cur = step * row
+        while next_circle < len(order) and y_lows[order[next_circle]] <= y_cur:
+            active.append(order[next_circle])
+            next_circle += 1
+        if not active:
+            continue
+        active = [i for i in active if y_highs[i] >= y_cur]
+
+        chords = []
+        for i in active:
+            center_x, center_y, radius = gazes[i]
+            dy = y_cur - center_y
+            if abs(dy) < radius:
+                dx = math.sqrt(radius ** 2 - dy ** 2)
+                chords.append((center_x - dx, center_x + dx, i))
+        chords.sort()
+
+        right_end = -math.inf
+        group_right_ends = [-math.inf] * num_groups
+        pair_right_ends = [-math.inf] * len(pairs)
+        for (x0, x1, i) in chords:
+            if x1 > right_end:
+                total += x1 - max(right_end, x0)
+                right_end = x1
+            for group in memberships[i]:
+                if x1 > group_right_ends[group]:
+                    group_totals[group] += x1 - max(group_right_ends[group], x0)
+                    group_right_ends[group] = x1
+                for k in pairs_of_group[group]:
+                    if x1 > pair_right_ends[k]:
+                        pair_totals[k] += x1 - max(pair_right_ends[k], x0)
+                        pair_right_ends[k] = x1
+
+    group_areas = [group_total * step for group_total in group_totals]
+    overlaps = [max(0.0, group_areas[group] + group_areas[other_group] - pair_total * step)
+                for (group, other_group), pair_total in zip(pairs, pair_totals)]
+    return total * step, group_areas, overlaps
+
+
+def chord_width(circles, y: float) -> float:
+    """
+    :param circles: a list of Circle objects
+    :param y: the horizontal line y = y
+    :return: the total length of the line y = y which lies within one or more of the circles
+    """
+    right_end = -math.inf
+    width: float = 0
+    chords = []
+    for circle in circles:
+        dy = y - circle.center_y
+        if abs(dy) < circle.radius:
+            dx = math.sqrt(circle.radius ** 2 - dy ** 2)
+            chords.append((circle.center_x - dx, circle.center_x + dx))
+    chords.sort()
+    for (x0, x1) in chords:
+        if x1 < right_end:
+            continue
+        width += x1 - max(right_end, x0)
+        right_end = x1
+    return width
+
+
+def width_breakpoints(circles) -> List[float]:
+    """
+    Returns the y coordinates where the chord width of a list of circles may have a kink: the tops and bottoms of the
+    circles and the points where two circles' boundaries cross. Between two breakpoints the width is smooth.
+    :param circles: a list of Circle objects
+    :return: the sorted breakpoints
+    """
+    breakpoints = set()
+    for i, circle in enumerate(circles):
+        breakpoints.add(circle.y_low)
+        breakpoints.add(circle.y_high)
+        for other in circles[i + 1:]:
+            d = circle_distance(circle, other)
+            if d == 0 or d >= circle.radius + other.radius or d <= abs(circle.radius - other.radius):
+                continue
+            # distance from circle's center to the chord through both crossing points, along the line of centers
+            a = (circle.radius ** 2 - other.radius ** 2 + d ** 2) / (2 * d)
+            h = math.sqrt(max(circle.radius ** 2 - a ** 2, 0.0))
+            mid_y = circle.center_y + a * (other.center_y - circle.center_y) / d
+            offset = h * (other.center_x - circle.center_x) / d
+            breakpoints.add(mid_y + offset)
+            breakpoints.add(mid_y - offset)
+    return sorted(breakpoints)
+
+
+# nodes and weights of 5 point Gauss-Legendre quadrature on [-1, 1]
+GAUSS_NODES, GAUSS_WEIGHTS = (values.tolist() for values in np.polynomial.legendre.leggauss(5))
+
+# the deepest an interval between two breakpoints is bisected by adaptive_area
+MAX_ADAPTIVE_DEPTH = 40
+
+
+def adaptive_area(circles, error_target: float, progress=None) -> Tuple[float, int]:
+    """
+    Calculates the total area of a list of overlapping circles by integrating the chord width over y. The y range is
+    split at every point where the width has a kink, and each piece is integrated with Gauss-Legendre quadrature,
+    bisecting only the pieces whose estimate has not yet converged.
+    :param circles: a list of Circle objects
+    :param error_target: the absolute error tolerated on the area, shared between the pieces by their length
+    :param progress: a ProgressReporter to report the chord width evaluations to
+    :return: the area covered by the circles, and the number of times the chord width was evaluated
+    """
+    circles = [circle for circle in circles if circle.radius > 0]
+    if not circles:
+        return 0.0, 0
+    num_evaluations = 0
+
+    def gauss(y_low, y_high):
+        nonlocal num_evaluations
+        num_evaluations += len(GAUSS_NODES)
+        if progress is not None:
+            progress.update('evaluations', num_evaluations)
+        half = (y_high - y_low) / 2
+        middle = (y_high + y_low) / 2
+        return half * sum(weight * chord_width(circles, middle + half * node)
+                          for node, weight in zip(GAUSS_NODES, GAUSS_WEIGHTS))
+
+    def integrate(y_low, y_high, estimate, tolerance, depth):
+        middle = (y_low + y_high) / 2
+        low_half = gauss(y_low, middle)
+        high_half = gauss(middle, y_high)
+        if abs(low_half + high_half - estimate) <= tolerance or depth >= MAX_ADAPTIVE_DEPTH:
+            return low_half + high_half
+        return integrate(y_low, middle, low_half, tolerance / 2, depth + 1) + \
+            integrate(middle, y_high, high_half, tolerance / 2, depth + 1)
+
+    breakpoints = width_breakpoints(circles)
+    total_length = breakpoints[-1] - breakpoints[0]
+    total: float = 0
+    for y_low, y_high in zip(breakpoints, breakpoints[1:]):
+        if y_high > y_low:
+            total += integrate(y_low, y_high, gauss(y_low, y_high),
+                               error_target * (y_high - y_low) / total_length, 0)
+    return total, num_evaluations
+
+
+def count_hits(xs: np.ndarray, ys: np.ndarray, center_x: np.ndarray, center_y: np.ndarray,
+               radius_sq: np.ndarray) -> int:
+    """
+    Counts the points which lie within one or more of the circles, comparing squared distances
+    :param xs: x coordinates of the points
+    :param ys: y coordinates of the points
+    :param center_x: x coordinates of the centers of the circles
+    :param center_y: y coordinates of the centers of the circles
+    :param radius_sq: squared radii of the circles
+    :return: the number of points inside the union of the circles
+    """
+    inside = ((xs[:, None] - center_x[None, :]) ** 2 + (ys[:, None] - center_y[None, :]) ** 2
+              < radius_sq[None, :]).any(axis=1)
+    return int(np.count_nonzero(inside))
+
+
+class CircleGrid:
+    """
+    A uniform grid over the centers of a trial's circles, used to test points only against nearby circles
+    """
+
+    def __init__(self, circles, cell_size: float = None):
+        """
+        circles: list of Circle objects
+        cell_size: the side length of a grid cell, defaults to the largest radius so that a point can only lie
+        within circles whose centers are in its own cell or one of the eight cells around it
+        """
+        self.center_x, self.center_y, self.radius = circle_arrays(circles)
+        self.radius_sq = self.radius ** 2
+        # plain lists are faster than array indexing for the single point queries
+        self._circles = list(zip(self.center_x.tolist(), self.center_y.tolist(), self.radius_sq.tolist()))
+        if cell_size is None:
+            cell_size = float(self.radius.max()) if len(circles) else 1.0
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+        self.cells = {}
+        for i, cell in enumerate(zip(np.floor(self.center_x / self.cell_size).astype(np.int64).tolist(),
+                                     np.floor(self.center_y / self.cell_size).astype(np.int64).tolist())):
+            self.cells.setdefault(cell, []).append(i)
+        self._neighbours = {}
+
+    def neighbours(self, cell: Tuple[int, int]) -> np.ndarray:
+        """
+        :param cell: the (column, row) of a grid cell
+        :return: the indices of the circles which may contain a point in that cell
+        """
+        if cell not in self._neighbours:
+            col, row = cell
+            indices = []
+            for d_col in (-1, 0, 1):
+                for d_row in (-1, 0, 1):
+                    indices.extend(self.cells.get((col + d_col, row + d_row), ()))
+            self._neighbours[cell] = np.array(indices, dtype=np.int64)
+        return self._neighbours[cell]
+
+    def contains(self, point) -> bool:
+        """
+        :param point: a tuple representing a 2D point, (x coordinate, y coordinate)
+        :return: True if the point is within one or more of the circles, False if otherwise
+        """
+        x, y = point
+        for i in self.neighbours((math.floor(x / self.cell_size), math.floor(y / self.cell_size))).tolist():
+            center_x, center_y, radius_sq = self._circles[i]
+            if (x - center_x) ** 2 + (y - center_y) ** 2 < radius_sq:
+                return True
+        return False
+
+    def cell_groups(self, xs: np.ndarray, ys: np.ndarray):
+        """
+        Groups points by the grid cell they fall in
+        :param xs: x coordinates of the points
+        :param ys: y coordinates of the points
+        :return: a generator of (indices of the points in a cell, indices of the circles which may contain them),
+        skipping the cells with no circles nearby
+        """
+        cols = np.floor(xs / self.cell_size).astype(np.int64)
+        rows = np.floor(ys / self.cell_size).astype(np.int64)
+        col_min = int(cols.min()) if len(cols) else 0
+        row_min = int(rows.min()) if len(rows) else 0
+        num_rows = int(rows.max()) - row_min + 1 if len(rows) else 1
+        keys = (cols - col_min) * num_rows + (rows - row_min)
+
+        # group the points by cell, then test each group against the circles around its cell only
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            key = int(keys[start])
+            indices = self.neighbours((key // num_rows + col_min, key % num_rows + row_min))
+            if len(indices) > 0:
+                yield order[start:end], indices
+
+    def count_hits(self, xs: np.ndarray, ys: np.ndarray) -> int:
+        """
+        Counts the points which lie within one or more of the circles
+        :param xs: x coordinates of the points
+        :param ys: y coordinates of the points
+        :return: the number of points inside the union of the circles
+        """
+        num_hits = 0
+        for points, indices in self.cell_groups(xs, ys):
+            num_hits += count_hits(xs[points], ys[points], self.center_x[indices], self.center_y[indices],
+                                   self.radius_sq[indices])
+        return num_hits
+
+    def inside(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        :param xs: x coordinates of the points
+        :param ys: y coordinates of the points
+        :return: for every point, True if it lies within one or more of the circles
+        """
+        return self.coverage(xs, ys) > 0
+
+    def coverage(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        :param xs: x coordinates of the points
+        :param ys: y coordinates of the points
+        :return: for every point, the number of circles it lies within
+        """
+        counts = np.zeros(len(xs), dtype=np.int64)
+        for points, indices in self.cell_groups(xs, ys):
+            counts[points] = ((xs[points, None] - self.center_x[None, indices]) ** 2
+                              + (ys[points, None] - self.center_y[None, indices]) ** 2
+                              < self.radius_sq[None, indices]).sum(axis=1)
+        return counts
+
+
+def is_inside_circle(circles, point, index=None):
+    """
+    :param circles: a list of Circle objects or a CircleSet
+    :param point: a tuple representing a 2D point, (x coordinate, y coordinate)
+    :param index: a CircleGrid over the circles, if given only the circles near the point are tested
+    :return: True if the point is within one or more of the circles, False if otherwise
+    """
+    if index is not None:
+        return index.contains(point)
+    if isinstance(circles, CircleSet):
+        return circles.contains(point)
+    for circle in circles:
+        if math.sqrt(((point[0] - circle.center_x) ** 2) + ((point[1] - circle.center_y) ** 2)) < circle.radius:
+            return True
+    return False
+
+
+def monte_carlo_sampling(x_min, y_min, x_max, y_max, num_trials, circles, error_tolerance, index=None,
+                         progress=None):
+    """
+    Estimates the area bound by a list of circles using Monte Carlo Sampling
+    :param x_min: the lowest x coordinate bound by the circles
+    :param y_min: the lowest y coordinate bound by the circles
+    :param x_max: the highest x coordinate bound by the circles
+    :param y_max: the highest y coordinate bound by the circles
+    :param num_trials: number of trials
+    :param circles: list of Circle objects or a CircleSet
+    :param error_tolerance: the upper bound for 3 * standard deviation, as a percentage of the estimated area
+    :param index: a CircleGrid over the circles, used for the point-in-circle tests if given
+    :param progress: a ProgressReporter to report the samples drawn to
+    :return: (estimated area, standard deviation, number of samples) for every round
+    """
+    bound_box_area = (x_max - x_min) * (y_max - y_min)
+
+    num_hits = 0
+    num_tries = 0
+
+    estimates = []
+
+    while True:
+        if is_inside_circle(circles, (random.uniform(x_min, x_max), random.uniform(y_min, y_max)), index):
+            num_hits += 1
+
+        num_tries += 1
+        if progress is not None and num_tries % 1024 == 0:
+            progress.update('samples', num_tries)
+
+        if num_tries == num_trials:
+            estimated_proportion = num_hits / num_trials
+            estimated_area = bound_box_area * estimated_proportion
+            std_dev = bound_box_area * math.sqrt(estimated_proportion * (1 - estimated_proportion) / num_trials)
+
+            estimates.append((estimated_area, std_dev, num_tries))
+            if std_dev * 3 <= (estimated_area * error_tolerance / 100):
+                break
+            num_trials *= 2
+    return estimates
+
+
+def vectorized_monte_carlo_sampling(x_min, y_min, x_max, y_max, num_trials, circles, error_tolerance,
+                                    seed=None, index=None, progress=None) -> List[Tuple[float, float, int]]:
+    """
+    Estimates the area bound by a list of circles using Monte Carlo Sampling, drawing the points in batches and
+    testing each batch against all circles at once. When the sample size doubles, the hits of the earlier rounds
+    are kept and only the new half of the samples is drawn.
+    :param x_min: the lowest x coordinate bound by the circles
+    :param y_min: the lowest y coordinate bound by the circles
+    :param x_max: the highest x coordinate bound by the circles
+    :param y_max: the highest y coordinate bound by the circles
+    :param num_trials: number of trials in the first round
+    :param circles: list of Circle objects
+    :param error_tolerance: the upper bound for 3 * standard deviation, as a percentage of the estimated area
+    :param seed: seed for the random number generator, so that runs can be reproduced
+    :param index: a CircleGrid over the circles, built here if not given
+    :param progress: a ProgressReporter to report the samples drawn to
+    :return: (estimated area, standard deviation, number of samples) for every round
+    """
+    rng = np.random.default_rng(seed)
+    bound_box_area = (x_max - x_min) * (y_max - y_min)
+    if index is None:
+        index = CircleGrid(circles)
+    batch_size = max(1, BLOCK_ELEMENTS // max(1, len(circles)))
+
+    num_hits = 0
+    num_tries = 0
+
+    estimates = []
+
+    while True:
+        while num_tries < num_trials:
+            size = min(batch_size, num_trials - num_tries)
+            num_hits += index.count_hits(rng.uniform(x_min, x_max, size), rng.uniform(y_min, y_max, size))
+            num_tries += size
+            if progress is not None:
+                progress.update('samples', num_tries)
+
+        estimated_proportion = num_hits / num_trials
+        estimated_area = bound_box_area * estimated_proportion
+        std_dev = bound_box_area * math.sqrt(estimated_proportion * (1 - estimated_proportion) / num_trials)
+        estimates.append((estimated_area, std_dev, num_tries))
+        if std_dev * 3 <= (estimated_area * error_tolerance / 100):
+            break
+        num_trials *= 2
+    return estimates
+
+
+def bounding_box(circles) -> dict:
+    """
+    :param circles: a non-empty list of Circle objects or a CircleSet
+    :return: the tightest box around the circles, in the same format as the trial min / max data
+    """
+    if isinstance(circles, CircleSet):
+        return dict(circles.min_max_data)
+    return {'x_min': min(circle.center_x - circle.radius for circle in circles),
+            'x_max': max(circle.center_x + circle.radius for circle in circles),
+            'y_min': min(circle.center_y - circle.radius for circle in circles),
+            'y_max': max(circle.center_y + circle.radius for circle in circles)}
+
+
+def overlap_components(circles) -> List[list]:
+    """
+    Groups circles into clusters whose union areas do not overlap, so that each cluster can be computed over its own
+    bounding box. Circles which lie entirely within another circle (including duplicates) add no area and are dropped.
+    :param circles: a list of Circle objects
+    :return: a list of clusters, each a list of Circle objects, in the order of their first circle
+    """
+    circles = [circle for circle in circles if circle.radius > 0]
+    if not circles:
+        return []
+    # two circles can only overlap if their centers are less than two of the largest radii apart
+    grid = CircleGrid(circles, 2 * max(circle.radius for circle in circles))
+
+    def neighbours(i):
+        return grid.neighbours((math.floor(circles[i].center_x / grid.cell_size),
+                                math.floor(circles[i].center_y / grid.cell_size))).tolist()
+
+    kept = []
+    for i, circle in enumerate(circles):
+        for j in neighbours(i):
+            other = circles[j]
+            if j != i and circle_distance(circle, other) + circle.radius <= other.radius \
+                    and (circle.radius < other.radius or j < i):
+                break
+        else:
+            kept.append(i)
+
+    # union-find over the circles that remain
+    parent = {i: i for i in kept}
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in kept:
+        for j in neighbours(i):
+            if j in parent and j > i \
+                    and circle_distance(circles[i], circles[j]) < circles[i].radius + circles[j].radius:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    components = {}
+    for i in kept:
+        components.setdefault(find(i), []).append(circles[i])
+    return list(components.values())
+
+
+# the fewest samples a cluster gets in the first round of decomposed_sampling, so that a small cluster's estimate
+# of its variance is not degenerate
+MIN_COMPONENT_TRIALS = 1024
+
+
+def decomposed_sampling(sample, num_trials, circles, seed=None) -> List[Tuple[float, float, int]]:
+    """
+    Runs a Monte Carlo sampler over each cluster of overlapping circles separately, within the cluster's own bounding
+    box, and adds up their estimates: the areas and the samples add up, and so do the variances. Each cluster runs
+    until it meets the error tolerance on its own, so the sum meets it too. The estimates of a cluster which needed
+    fewer rounds than the others are carried into the later rounds.
+    :param sample: a function of (cluster, bounding box of the cluster, number of trials in the first round, seed)
+    returning the sampler's (estimated area, standard deviation, number of samples) for every round
+    :param num_trials: number of trials in the first round, over all clusters in proportion to the areas of their
+    boxes
+    :param circles: list of Circle objects or a CircleSet
+    :param seed: seed from which each cluster's seed is derived, so that runs can be reproduced
+    :return: (estimated area, standard deviation, number of samples) for every round
+    """
+    components = overlap_components(circles)
+    if not components:
+        return [(0.0, 0.0, 0)]
+    boxes = [bounding_box(component) for component in components]
+    box_areas = [(box['x_max'] - box['x_min']) * (box['y_max'] - box['y_min']) for box in boxes]
+    total_box_area = sum(box_areas)
+    seeds = np.random.SeedSequence(seed).spawn(len(components))
+
+    component_estimates = []
+    for component, box, box_area, component_seed in zip(components, boxes, box_areas, seeds):
+        component_trials = max(MIN_COMPONENT_TRIALS, int(num_trials * box_area / total_box_area))
+        component_estimates.append(sample(component, box, component_trials, component_seed))
+
+    estimates = []
+    for i in range(max(len(rounds) for rounds in component_estimates)):
+        rounds = [component_rounds[min(i, len(component_rounds) - 1)] for component_rounds in component_estimates]
+        estimates.append((sum(area for area, _, _ in rounds), math.sqrt(sum(std_dev ** 2 for _, std_dev, _ in rounds)),
+                          sum(samples for _, _, samples in rounds)))
+    return estimates
+
+
+# the points drawn in each cell of the stratified sampler's grid in the first round, at least 2 for a variance
+STRATUM_POINTS = 4
+
+
+def stratified_monte_carlo_sampling(x_min, y_min, x_max, y_max, num_trials, circles, error_tolerance,
+                                    seed=None, index=None, progress=None) -> List[Tuple[float, float, int]]:
+    """
+    Estimates the area bound by a list of circles using stratified Monte Carlo Sampling: the bounding box is split
+    into a grid of cells and every cell gets the same number of points. Cells wholly inside or outside the union add
+    no variance, so only the cells along its boundary contribute to the error.
+    :param x_min: the lowest x coordinate bound by the circles
+    :param y_min: the lowest y coordinate bound by the circles
+    :param x_max: the highest x coordinate bound by the circles
+    :param y_max: the highest y coordinate bound by the circles
+    :param num_trials: number of trials in the first round, sets the size of the grid
+    :param circles: list of Circle objects or a CircleSet
+    :param error_tolerance: the upper bound for 3 * standard deviation, as a percentage of the estimated area
+    :param seed: seed for the random number generator, so that runs can be reproduced
+    :param index: a CircleGrid over the circles, built here if not given
+    :param progress: a ProgressReporter to report the samples drawn to
+    :return: (estimated area, standard deviation, number of samples) for every round
+    """
+    rng = np.random.default_rng(seed)
+    if index is None:
+        index = CircleGrid(circles)
+    width = x_max - x_min
+    height = y_max - y_min
+    # roughly square cells
+    num_cells = max(1, num_trials // STRATUM_POINTS)
+    num_cols = max(1, int(round(math.sqrt(num_cells * width / height)))) if height > 0 else num_cells
+    num_rows = max(1, num_cells // num_cols)
+    num_cells = num_cols * num_rows
+    cell_width = width / num_cols
+    cell_height = height / num_rows
+    cell_area = cell_width * cell_height
+    batch_size = max(1, BLOCK_ELEMENTS // max(1, len(circles)))
+
+    hits = np.zeros(num_cells, dtype=np.int64)
+    cell_tries = 0
+    num_tries = 0
+    target = STRATUM_POINTS
+
+    estimates = []
+
+    while True:
+        # draw the points each cell is short of, a few cells at a time
+        new_points = target - cell_tries
+        batch_cells = max(1, batch_size // new_points)
+        for first_cell in range(0, num_cells, batch_cells):
+            cells = np.repeat(np.arange(first_cell, min(first_cell + batch_cells, num_cells)), new_points)
+            xs = x_min + (cells % num_cols + rng.random(len(cells))) * cell_width
+            ys = y_min + (cells // num_cols + rng.random(len(cells))) * cell_height
+            hits[first_cell:first_cell + batch_cells] += np.bincount(
+                cells[index.inside(xs, ys)] - first_cell, minlength=min(batch_cells, num_cells - first_cell))
+            num_tries += len(cells)
+            if progress is not None:
+                progress.update('samples', num_tries)
+        cell_tries = target
+
+        proportions = hits / cell_tries
+        estimated_area = cell_area * float(proportions.sum())
+        # the variance of each cell's mean, estimated without bias from its own points
+        variance = cell_area ** 2 * float((proportions * (1 - proportions)).sum()) / (cell_tries - 1)
+        std_dev = math.sqrt(variance)
+        estimates.append((estimated_area, std_dev, num_tries))
+        if std_dev * 3 <= (estimated_area * error_tolerance / 100):
+            break
+        target *= 2
+    return estimates
+
+
+# the number of independently scrambled copies of the Halton sequence, the spread of their estimates is the error
+HALTON_REPLICATES = 16
+
+# the digits of the scrambled radical inverse in bases 2 and 3, both resolve about 1e-10
+HALTON_DIGITS = {2: 34, 3: 21}
+
+
+def scrambled_radical_inverse(indices: np.ndarray, base: int, permutations: np.ndarray) -> np.ndarray:
+    """
+    Returns the points of a van der Corput sequence with randomly permuted digits, which are still evenly spread but
+    uniformly distributed, so that the estimates of independently scrambled copies can be compared
+    :param indices: the positions in the sequence, non-negative integers
+    :param base: the base of the sequence
+    :param permutations: a permutation of the digits 0 .. base - 1 for every digit position, least significant first
+    :return: the points, in [0, 1)
+    """
+    points = np.zeros(len(indices))
+    remaining = indices.copy()
+    scale = 1.0 / base
+    for permutation in permutations:
+        points += permutation[remaining % base] * scale
+        remaining //= base
+        scale /= base
+    return points
+
+
+def halton_monte_carlo_sampling(x_min, y_min, x_max, y_max, num_trials, circles, error_tolerance,
+                                seed=None, index=None, progress=None) -> List[Tuple[float, float, int]]:
+    """
+    Estimates the area bound by a list of circles using randomized quasi Monte Carlo Sampling: the points follow the
+    two dimensional Halton sequence in bases 2 and 3, which covers the bounding box more evenly than random points.
+    Several copies of the sequence are scrambled independently, and the standard deviation is that of the mean of
+    their estimates. When the sample size doubles each copy carries on along its sequence.
+    :param x_min: the lowest x coordinate bound by the circles
+    :param y_min: the lowest y coordinate bound by the circles
+    :param x_max: the highest x coordinate bound by the circles
+    :param y_max: the highest y coordinate bound by the circles
+    :param num_trials: number of trials in the first round, over all copies
+    :param circles: list of Circle objects or a CircleSet
+    :param error_tolerance: the upper bound for 3 * standard deviation, as a percentage of the estimated area
+    :param seed: seed for the scrambling, so that runs can be reproduced
+    :param index: a CircleGrid over the circles, built here if not given
+    :param progress: a ProgressReporter to report the samples drawn to
+    :return: (estimated area, standard deviation, number of samples) for every round
+    """
+    rng = np.random.default_rng(seed)
+    if index is None:
+        index = CircleGrid(circles)
+    bound_box_area = (x_max - x_min) * (y_max - y_min)
+    scrambles = [{base: np.array([rng.permutation(base) for _ in range(num_digits)])
+                  for base, num_digits in HALTON_DIGITS.items()} for _ in range(HALTON_REPLICATES)]
+    batch_size = max(1, BLOCK_ELEMENTS // max(1, len(circles)))
+
+    hits = np.zeros(HALTON_REPLICATES, dtype=np.int64)
+    replicate_tries = 0
+    num_tries = 0
+    target = max(2, num_trials // HALTON_REPLICATES)
+
+    estimates = []
+
+    while True:
+        for replicate, scramble in enumerate(scrambles):
+            for start in range(replicate_tries, target, batch_size):
+                positions = np.arange(start, min(start + batch_size, target), dtype=np.int64)
+                xs = x_min + scrambled_radical_inverse(positions, 2, scramble[2]) * (x_max - x_min)
+                ys = y_min + scrambled_radical_inverse(positions, 3, scramble[3]) * (y_max - y_min)
+                hits[replicate] += index.count_hits(xs, ys)
+                num_tries += len(positions)
+                if progress is not None:
+                    progress.update('samples', num_tries)
+        replicate_tries = target
+
+        areas = bound_box_area * hits / replicate_tries
+        estimated_area = float(areas.mean())
+        std_dev = float(areas.std(ddof=1)) / math.sqrt(HALTON_REPLICATES)
+        estimates.append((estimated_area, std_dev, num_tries))
+        if std_dev * 3 <= (estimated_area * error_tolerance / 100):
+            break
+        target *= 2
+    return estimates
+
+
+def importance_monte_carlo_sampling(num_trials, circles, error_tolerance, seed=None, index=None,
+                                    progress=None) -> List[Tuple[float, float, int]]:
+    """
+    Estimates the area bound by a list of circles using importance sampling over the circles themselves: a circle is
+    picked with probability proportional to its area and a point is drawn uniformly within it. Each point is weighted
+    by the total area of the circles over the number of circles it lies within, so that the weights average to the
+    area of the union. No point is wasted outside the union, and where the circles barely overlap every weight is
+    close to the mean.
+    :param num_trials: number of trials in the first round
+    :param circles: list of Circle objects or a CircleSet
+    :param error_tolerance: the upper bound for 3 * standard deviation, as a percentage of the estimated area
+    :param seed: seed for the random number generator, so that runs can be reproduced
+    :param index: a CircleGrid over the circles, built here if not given
+    :param progress: a ProgressReporter to report the samples drawn to
+    :return: (estimated area, standard deviation, number of samples) for every round
+    """
+    rng = np.random.default_rng(seed)
+    center_x, center_y, radius = circle_arrays(circles)
+    disc_areas = math.pi * radius ** 2
+    total_disc_area = float(disc_areas.sum())
+    if total_disc_area == 0:
+        return [(0.0, 0.0, 0)]
+    if index is None:
+        index = CircleGrid(circles)
+    batch_size = max(1, BLOCK_ELEMENTS // len(circles))
+
+    weight_sum = 0.0
+    weight_sq_sum = 0.0
+    num_tries = 0
+
+    estimates = []
+
+    while True:
+        while num_tries < num_trials:
+            size = min(batch_size, num_trials - num_tries)
+            chosen = rng.choice(len(disc_areas), size, p=disc_areas / total_disc_area)
+            distance = radius[chosen] * np.sqrt(rng.random(size))
+            angle = TWO_PI * rng.random(size)
+            xs = center_x[chosen] + distance * np.cos(angle)
+            ys = center_y[chosen] + distance * np.sin(angle)
+            # a point drawn within a circle lies within at least that circle, whatever the rounding
+            weights = total_disc_area / np.maximum(index.coverage(xs, ys), 1)
+            weight_sum += float(weights.sum())
+            weight_sq_sum += float((weights ** 2).sum())
+            num_tries += size
+            if progress is not None:
+                progress.update('samples', num_tries)
+
+        estimated_area = weight_sum / num_tries
+        variance = max(weight_sq_sum / num_tries - estimated_area ** 2, 0.0) * num_tries / max(1, num_tries - 1)
+        std_dev = math.sqrt(variance / num_tries)
+        estimates.append((estimated_area, std_dev, num_tries))
+        if std_dev * 3 <= (estimated_area * error_tolerance / 100):
+            break
+        num_trials *= 2
+    return estimates
+
+
+def trial_area(area_engine: str, circles, min_max_data, step_size: int,
+               decompose=False, progress=None, rows=None, error_target=None) -> Tuple[float, int]:
+    """
+    Calculates the area covered by a trial's circles with the requested engine
+    :param area_engine: one of AREA_ENGINES
+    :param circles: list of Circle objects or a CircleSet
+    :param min_max_data: the bounding box of the trial
+    :param step_size: the scanline step will be 1 / 2 ^ step_size, the adaptive engine takes 1 / 2 ^ step_size as its
+    absolute error target instead unless error_target is given, ignored by the exact engine
+    :param decompose: if True, each cluster of overlapping circles is computed over its own bounding box; the
+    adaptive engine's error target is shared between the clusters by their height, as adaptive_area shares it
+    between its pieces
+    :param progress: a ProgressReporter to report the rows or chord widths processed to
+    :param rows: the (first, last) indices of the rows the scanline engines visit, by default every row of the
+    bounding box; the areas of bands of rows add up to the area of the trial
+    :param error_target: the absolute error target of the adaptive engine, any positive number
+    :return: the area covered by the circles, and the number of rows or chord widths the engine evaluated
+    """
+    if error_target is None:
+        error_target = 1 / (1 << step_size)
+    if decompose:
+        components = overlap_components(circles)
+        boxes = [bounding_box(component) for component in components]
+        total_height = sum(box['y_max'] - box['y_min'] for box in boxes)
+        results = [trial_area(area_engine, component, box, step_size, progress=progress,
+                              error_target=error_target * (box['y_max'] - box['y_min']) / total_height)
+                   for component, box in zip(components, boxes)]
+        return sum(area for area, _ in results), sum(evaluations for _, evaluations in results)
+    if area_engine == 'exact':
+        return exact_area(circles), 0
+    if area_engine == 'adaptive':
+        return adaptive_area(circles, error_target, progress)
+    # Adjust the step size up or down if less or more precision is desired, respectively
+    step: float = 1 / (1 << step_size)
+    y_min_step, y_max_step = rows if rows is not None else trial_rows(min_max_data, step_size)
+    num_rows = y_max_step - y_min_step + 1
+    if area_engine == 'vectorized':
+        return vectorized_intersection_area(circles, y_min_step, y_max_step, step, progress), num_rows
+    if area_engine == 'sweep':
+        return sweep_intersection_area(circles, y_min_step, y_max_step, step, progress), num_rows
+    return intersection_area(circles, y_min_step, y_max_step, step, progress), num_rows
+
+
+AREA_ENGINES = ('scanline', 'sweep', 'vectorized', 'adaptive', 'exact')
+
+
+def trial_monte_carlo(monte_carlo_sampler, circles, min_max_data, error_tolerance, seed=None, decompose=False,
+                      progress=None, num_trials=MONTE_CARLO_FIRST_ROUND) -> List[Tuple[float, float, int]]:
+    """
+    Estimates the area covered by a trial's circles with the requested Monte Carlo sampler
+    :param monte_carlo_sampler: one of MONTE_CARLO_SAMPLERS
+    :param circles: list of Circle objects or a CircleSet
+    :param min_max_data: the bounding box of the trial
+    :param error_tolerance: the upper bound for 3 * standard deviation, as a percentage of the estimated area
+    :param seed: seed for the numpy based samplers, ignored by the uniform sampler
+    :param decompose: if True, each cluster of overlapping circles is sampled separately within its own bounding box
+    :param progress: a ProgressReporter to report the samples drawn to
+    :param num_trials: number of trials in the first round
+    :return: (estimated area, standard deviation, number of samples) for every round
+    """
+    if decompose:
+        return decomposed_sampling(lambda component, box, component_trials, component_seed: trial_monte_carlo(
+            monte_carlo_sampler, component, box, error_tolerance, component_seed, progress=progress,
+            num_trials=component_trials), num_trials, circles, seed)
+    # build the spatial index once and share it between the samplers' point queries
+    index = CircleGrid(circles)
+    if monte_carlo_sampler == 'vectorized':
+        return vectorized_monte_carlo_sampling(min_max_data['x_min'], min_max_data['y_min'],
+                                               min_max_data['x_max'], min_max_data['y_max'],
+                                               num_trials, circles, error_tolerance, seed, index, progress)
+    if monte_carlo_sampler == 'stratified':
+        return stratified_monte_carlo_sampling(min_max_data['x_min'], min_max_data['y_min'],
+                                               min_max_data['x_max'], min_max_data['y_max'],
+                                               num_trials, circles, error_tolerance, seed, index, progress)
+    if monte_carlo_sampler == 'halton':
+        return halton_monte_carlo_sampling(min_max_data['x_min'], min_max_data['y_min'],
+                                           min_max_data['x_max'], min_max_data['y_max'],
+                                           num_trials, circles, error_tolerance, seed, index, progress)
+    if monte_carlo_sampler == 'importance':
+        return importance_monte_carlo_sampling(num_trials, circles, error_tolerance, seed, index, progress)
+    return monte_carlo_sampling(min_max_data['x_min'], min_max_data['y_min'],
+                                min_max_data['x_max'], min_max_data['y_max'],
+                                num_trials, circles, error_tolerance, index, progress)
+
+
+# stratified, halton and importance reduce the variance, reaching the tolerance with fewer samples than vectorized
+MONTE_CARLO_SAMPLERS = ('uniform', 'vectorized', 'stratified', 'halton', 'importance')
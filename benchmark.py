@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tracemalloc
+from time import perf_counter, process_time
+from ConcurrentCircles import read_gazes
+from area_engines import AREA_ENGINES, MONTE_CARLO_SAMPLERS, bounding_box, exact_area, trial_area, trial_monte_carlo
+from circles import Circle
+
+
+# slower than the baseline by more than this factor counts as a regression
+DEFAULT_REGRESSION_THRESHOLD = 1.25
+# runs shorter than this many seconds are too noisy to count as regressions
+MIN_REGRESSION_SECONDS = 0.01
+# the number of times every case is timed by default, the fastest time is kept
+DEFAULT_REPEAT = 5
+
+
+def read_circles(circles_file_path):
+    """
+    Reads a whitespace separated circle set, one "center_x center_y radius" line per circle, such as test.txt
+    :param circles_file_path: path to the circle set
+    :return: list of Circle objects
+    """
+    circles = []
+    with open(circles_file_path, 'r') as file:
+        for line in file:
+            if line.strip():
+                center_x, center_y, radius = (float(value) for value in line.split())
+                circles.append(Circle(center_x, center_y, radius))
+    return circles
+
+
+def synthetic_trial(num_gazes, min_radius, max_radius, num_clusters, spread, extent=1000.0, seed=0):
+    """
+    Generates the gazes of a trial as clusters of fixations
+    :param num_gazes: the number of gazes
+    :param min_radius: the smallest radius of a gaze
+    :param max_radius: the largest radius of a gaze
+    :param num_clusters: the number of clusters the gazes are spread over
+    :param spread: the standard deviation of the distance of a gaze from the center of its cluster
+    :param extent: the cluster centers lie in the square [0, extent] x [0, extent]
+    :param seed: seed for the random number generator
+    :return: list of Circle objects
+    """
+    rng = random.Random(seed)
+    centers = [(rng.uniform(0, extent), rng.uniform(0, extent)) for _ in range(num_clusters)]
+    circles = []
+    for i in range(num_gazes):
+        center_x, center_y = centers[i % num_clusters]
+        circles.append(Circle(rng.gauss(center_x, spread), rng.gauss(center_y, spread),
+                              rng.uniform(min_radius, max_radius)))
+    return circles
+
+
+def parse_synthetic(spec):
+    """
+    Parses a NUM_GAZES:MIN_RADIUS:MAX_RADIUS:NUM_CLUSTERS:SPREAD command line synthetic input
+    """
+    try:
+        num_gazes, min_radius, max_radius, num_clusters, spread = spec.split(':')
+        return int(num_gazes), float(min_radius), float(max_radius), int(num_clusters), float(spread)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected NUM_GAZES:MIN_RADIUS:MAX_RADIUS:NUM_CLUSTERS:SPREAD, "
+                                         "e.g. 200:20:60:4:80, got '{}'".format(spec))
+
+
+def measure(function, trace_memory, repeat=1):
+    """
+    Runs a function several times, timing it. The fastest of the runs is kept, as the slower ones only add the noise
+    of whatever else the machine was doing.
+    :param function: the function to run, without arguments
+    :param trace_memory: if True, the function is run once more under tracemalloc to find its peak memory, so that
+    the tracing does not distort the times
+    :param repeat: the number of timed runs
+    :return: the result of the function, the least wall seconds, the least CPU seconds and peak bytes allocated (None
+    if not traced)
+    """
+    wall_seconds = cpu_seconds = float('inf')
+    for _ in range(max(1, repeat)):
+        wall_start = perf_counter()
+        cpu_start = process_time()
+        result = function()
+        wall_seconds = min(wall_seconds, perf_counter() - wall_start)
+        cpu_seconds = min(cpu_seconds, process_time() - cpu_start)
+
+    peak_bytes = None
+    if trace_memory:
+        tracemalloc.start()
+        function()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, wall_seconds, cpu_seconds, peak_bytes
+
+
+def run_benchmarks(inputs, area_engines, monte_carlo_samplers, step_sizes, tolerances, seed=0, trace_memory=True,
+                   repeat=DEFAULT_REPEAT):
+    """
+    Runs every area engine at every step size and every Monte Carlo sampler at every tolerance on every input
+    :param inputs: list of (name, list of trials), each trial a list of Circle objects
+    :param area_engines: the engines from AREA_ENGINES to run
+    :param monte_carlo_samplers: the samplers from MONTE_CARLO_SAMPLERS to run
+    :param step_sizes: the scanline steps are 1 / 2 ^ step_size
+    :param tolerances: the Monte Carlo error tolerances, as percentages of the estimated area
+    :param seed: seed for the samplers
+    :param trace_memory: if True, the peak memory of every run is measured
+    :param repeat: the number of times every case is timed, the fastest time is recorded
+    :return: list of result records
+    """
+    records = []
+    for name, trials in inputs:
+        boxes = [bounding_box(circles) for circles in trials]
+        # the exact engine is the reference the accuracy of the other engines is measured against
+        reference = sum(exact_area(circles) for circles in trials)
+
+        cases = []
+        for area_engine in area_engines:
+            for step_size in ([None] if area_engine == 'exact' else step_sizes):
+                def run(area_engine=area_engine, step_size=step_size):
+                    results = [trial_area(area_engine, circles, box, step_size or 0)
+                               for circles, box in zip(trials, boxes)]
+                    return sum(area for area, _ in results), sum(work for _, work in results), None
+                cases.append(('area', area_engine, step_size, None, run))
+        for sampler in monte_carlo_samplers:
+            for tolerance in tolerances:
+                def run(sampler=sampler, tolerance=tolerance):
+                    random.seed(seed)
+                    estimates = [trial_monte_carlo(sampler, circles, box, tolerance, (seed, i))[-1]
+                                 for i, (circles, box) in enumerate(zip(trials, boxes))]
+                    return sum(area for area, _, _ in estimates), sum(samples for _, _, samples in estimates), \
+                        sum(std_dev ** 2 for _, std_dev, _ in estimates) ** 0.5
+                cases.append(('monte_carlo', sampler, None, tolerance, run))
+
+        for kind, engine, step_size, tolerance, run in cases:
+            (area, work, std_dev), wall_seconds, cpu_seconds, peak_bytes = measure(run, trace_memory, repeat)
+            record = {'input': name, 'kind': kind, 'engine': engine, 'step_size': step_size, 'tolerance': tolerance,
+                      'num_trials': len(trials), 'num_gazes': sum(len(circles) for circles in trials),
+                      'repeat': repeat, 'wall_seconds': wall_seconds, 'cpu_seconds': cpu_seconds,
+                      'peak_bytes': peak_bytes, 'area': area, 'reference_area': reference, 'std_dev': std_dev,
+                      'work': work,
+                      'relative_error': abs(area - reference) / reference if reference else 0.0}
+            records.append(record)
+    return records
+
+
+def record_key(record):
+    return record['input'], record['kind'], record['engine'], record['step_size'], record['tolerance']
+
+
+def format_record(record, baseline=None):
+    """
+    :param record: a result record
+    :param baseline: the matching record of the baseline, if any
+    :return: the record as one line of text
+    """
+    setting = "n={}".format(record['step_size']) if record['kind'] == 'area' else "tol={}".format(record['tolerance'])
+    if record['engine'] == 'exact':
+        setting = ""
+    line = "{:<28} {:<11} {:<10} {:<8} wall {:9.4f}s cpu {:9.4f}s rel err {:.2e}".format(
+        record['input'], record['kind'], record['engine'], setting, record['wall_seconds'], record['cpu_seconds'],
+        record['relative_error'])
+    if record['peak_bytes'] is not None:
+        line += " peak {:8.1f} KiB".format(record['peak_bytes'] / 1024)
+    if baseline is not None:
+        line += " ({:.2f}x baseline cpu)".format(record['cpu_seconds'] / baseline['cpu_seconds']
+                                                 if baseline['cpu_seconds'] > 0 else float('inf'))
+    return line
+
+
+def compare_with_baseline(records, baseline_records, threshold):
+    """
+    Prints every record next to the matching baseline record. The CPU times are compared rather than the wall
+    times, so that other processes competing for the machine do not show up as regressions.
+    :param records: the records of this run
+    :param baseline_records: the records of the baseline run
+    :param threshold: a record slower than its baseline by more than this factor is a regression
+    :return: the records which regressed
+    """
+    baseline = {record_key(record): record for record in baseline_records}
+    regressions = []
+    for record in records:
+        match = baseline.get(record_key(record))
+        print(format_record(record, match))
+        if match is not None and record['cpu_seconds'] > match['cpu_seconds'] * threshold \
+                and record['cpu_seconds'] - match['cpu_seconds'] >= MIN_REGRESSION_SECONDS:
+            regressions.append(record)
+    return regressions
+
+
+def main(argv=None):
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Benchmarks the area engines and Monte Carlo samplers")
+    parser.add_argument('--csv', action='append', default=None,
+                        help="gaze data files to benchmark, every trial in a file is run (default: the bundled "
+                             "0322_experiment_data_corrected.csv)")
+    parser.add_argument('--circles', action='append', default=None,
+                        help="circle sets of 'center_x center_y radius' lines (default: the bundled test.txt)")
+    parser.add_argument('--synthetic', type=parse_synthetic, action='append', default=None,
+                        metavar='NUM_GAZES:MIN_RADIUS:MAX_RADIUS:NUM_CLUSTERS:SPREAD',
+                        help="synthetic trials to benchmark, may be repeated")
+    parser.add_argument('--engines', nargs='+', choices=AREA_ENGINES, default=list(AREA_ENGINES))
+    parser.add_argument('--samplers', nargs='+', choices=MONTE_CARLO_SAMPLERS, default=list(MONTE_CARLO_SAMPLERS))
+    parser.add_argument('--step-sizes', nargs='+', type=int, default=[2, 4])
+    parser.add_argument('--tolerances', nargs='+', type=float, default=[5.0, 1.0])
+    parser.add_argument('--seed', type=int, default=0, help="seed for the samplers and the synthetic trials")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help="the number of times every case is timed, the fastest time is kept")
+    parser.add_argument('--no-memory', action='store_true', help="skip measuring the peak memory")
+    parser.add_argument('--save-baseline', metavar='PATH', help="write the results to a baseline file")
+    parser.add_argument('--compare', metavar='PATH', help="compare the results with a baseline file")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="slower than the baseline by more than this factor counts as a regression")
+    args = parser.parse_args(argv)
+
+    inputs = []
+    for csv_path in args.csv or [os.path.join(here, '0322_experiment_data_corrected.csv')]:
+        inputs.append((os.path.basename(csv_path), list(read_gazes(csv_path)[0].values())))
+    for circles_path in args.circles or [os.path.join(here, 'test.txt')]:
+        inputs.append((os.path.basename(circles_path), [read_circles(circles_path)]))
+    for num_gazes, min_radius, max_radius, num_clusters, spread in args.synthetic or [(200, 20, 60, 4, 80)]:
+        inputs.append(("synthetic-{}g-{}c".format(num_gazes, num_clusters),
+                       [synthetic_trial(num_gazes, min_radius, max_radius, num_clusters, spread, seed=args.seed)]))
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    records = run_benchmarks(inputs, args.engines, args.samplers, args.step_sizes, args.tolerances, args.seed,
+                             not args.no_memory, args.repeat)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as file:
+            json.dump({'python': sys.version, 'records': records}, file, indent=1)
+
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            baseline_records = json.load(file)['records']
+        regressions = compare_with_baseline(records, baseline_records, args.threshold)
+        if regressions:
+            print("{} regressions slower than {}x the baseline".format(len(regressions), args.threshold))
+            return 1
+    else:
+        for record in records:
+            print(format_record(record))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
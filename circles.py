@@ -0,0 +1,111 @@
+from typing import List, Tuple
+import numpy as np
+
+
+class Circle:
+    """
+    Represents a circle
+    """
+    # no per-instance __dict__, a trial can hold many thousands of circles
+    __slots__ = ('center_x', 'center_y', 'radius', 'y_low', 'y_high')
+
+    def __init__(self, center_x: float, center_y: float, radius: float):
+        """
+        center_x: x coordinate of center
+        center_y: y coordinate of center
+        radius: radius of circle
+        """
+        self.center_x = center_x
+        self.center_y = center_y
+        self.radius = radius
+        self.y_low = center_y - radius
+        self.y_high = center_y + radius
+
+    def __eq__(self, other):
+        return self.center_x == other.center_x and self.center_y == other.center_y and self.radius == other.radius
+
+
+class CircleSet:
+    """
+    The circles of a trial stored as three parallel float64 arrays, the x coordinates of the centers, the y
+    coordinates of the centers and the radii, together with their bounding box. A CircleSet can be used wherever a
+    list of Circle objects is expected: indexing and iterating produce Circle objects, slicing produces a CircleSet,
+    and the array based engines read the arrays directly.
+    """
+    __slots__ = ('center_x', 'center_y', 'radius', 'min_max_data', 'labels')
+
+    def __init__(self, center_x, center_y, radius, labels=None, copy=True):
+        """
+        center_x: x coordinates of the centers
+        center_y: y coordinates of the centers
+        radius: radii of the circles
+        labels: optional dict of label columns, each a list with one label per circle, e.g. the interest area of each
+        gaze; the labels play no part in comparing CircleSets
+        copy: if True the coordinates are copied, so the arrays may be views of memory which is released later; if
+        False float64 arrays are wrapped as they are, and the memory they view must outlive the CircleSet
+        """
+        as_array = np.array if copy else np.asarray
+        self.center_x = as_array(center_x, dtype=np.float64)
+        self.center_y = as_array(center_y, dtype=np.float64)
+        self.radius = as_array(radius, dtype=np.float64)
+        self.labels = labels
+        # the bounding box of the circles, in the same format as the trial min / max data, None if there are none
+        self.min_max_data = None
+        if len(self.radius):
+            self.min_max_data = {'x_min': float((self.center_x - self.radius).min()),
+                                 'x_max': float((self.center_x + self.radius).max()),
+                                 'y_min': float((self.center_y - self.radius).min()),
+                                 'y_max': float((self.center_y + self.radius).max())}
+
+    @classmethod
+    def from_circles(cls, circles) -> 'CircleSet':
+        """
+        :param circles: a list of Circle objects
+        :return: the same circles as a CircleSet
+        """
+        return cls([circle.center_x for circle in circles], [circle.center_y for circle in circles],
+                   [circle.radius for circle in circles])
+
+    def tuples(self) -> List[Tuple[float, float, float]]:
+        """
+        :return: the (center x, center y, radius) of every circle, as plain floats
+        """
+        return list(zip(self.center_x.tolist(), self.center_y.tolist(), self.radius.tolist()))
+
+    def contains(self, point) -> bool:
+        """
+        :param point: a tuple representing a 2D point, (x coordinate, y coordinate)
+        :return: True if the point is within one or more of the circles, False if otherwise
+        """
+        return bool(((point[0] - self.center_x) ** 2 + (point[1] - self.center_y) ** 2 < self.radius ** 2).any())
+
+    def __len__(self):
+        return len(self.radius)
+
+    def __iter__(self):
+        for center_x, center_y, radius in self.tuples():
+            yield Circle(center_x, center_y, radius)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            labels = None
+            if self.labels is not None:
+                labels = {column: values[item] for column, values in self.labels.items()}
+            return CircleSet(self.center_x[item], self.center_y[item], self.radius[item], labels)
+        return Circle(float(self.center_x[item]), float(self.center_y[item]), float(self.radius[item]))
+
+    def __eq__(self, other):
+        if isinstance(other, CircleSet):
+            return np.array_equal(self.center_x, other.center_x) and np.array_equal(self.center_y, other.center_y) \
+                and np.array_equal(self.radius, other.radius)
+        return len(self) == len(other) and all(circle == other_circle for circle, other_circle in zip(self, other))
+
+
+def circle_tuples(circles) -> List[Tuple[float, float, float]]:
+    """
+    :param circles: a list of Circle objects or a CircleSet
+    :return: the (center x, center y, radius) of every circle, as plain floats
+    """
+    if isinstance(circles, CircleSet):
+        return circles.tuples()
+    return [(circle.center_x, circle.center_y, circle.radius) for circle in circles]
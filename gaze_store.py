@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from area_engines import bounding_box
+from circles import CircleSet
+
+
+# bump whenever the layout of a store changes, stores of other versions are rebuilt
+STORE_VERSION = 1
+
+COORDINATE_COLUMNS = ('center_x', 'center_y', 'radius')
+
+
+def file_digest(path) -> str:
+    """
+    :param path: path to a file
+    :return: the sha256 of the file's content as a hex string
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_directory(store_root, source_path) -> str:
+    """
+    :param store_root: the directory holding the stores of every data file
+    :param source_path: path to a data file
+    :return: the directory of the data file's store, named after its absolute path so that data files with the same
+    name do not collide
+    """
+    source_path = os.path.abspath(source_path)
+    return os.path.join(store_root, "{}_{}".format(os.path.basename(source_path),
+                                                   hashlib.sha256(source_path.encode()).hexdigest()[:16]))
+
+
+class ColumnWriter:
+    """
+    Appends the values of one column to a raw file as they arrive, and turns the file into an .npy file once the
+    number of rows is known, so that a column is never held in memory whole
+    """
+
+    def __init__(self, path, dtype, row_shape=()):
+        """
+        path: path of the .npy file to write
+        dtype: the type of the values
+        row_shape: the shape of one row, e.g. (4,) for a table of four columns
+        """
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.num_rows = 0
+        self.raw_file = open(path + '.raw', 'wb')
+
+    def append(self, values):
+        """
+        :param values: the rows to append, anything np.asarray takes
+        """
+        values = np.ascontiguousarray(values, dtype=self.dtype).reshape((-1,) + self.row_shape)
+        self.raw_file.write(values.tobytes())
+        self.num_rows += len(values)
+
+    def finish(self):
+        """
+        Writes the .npy header followed by the raw values, copied over a chunk at a time
+        """
+        self.raw_file.close()
+        header = {'descr': np.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False,
+                  'shape': (self.num_rows,) + self.row_shape}
+        with open(self.path, 'wb') as file, open(self.path + '.raw', 'rb') as raw_file:
+            np.lib.format.write_array_header_1_0(file, header)
+            shutil.copyfileobj(raw_file, file, 1 << 20)
+        os.remove(self.path + '.raw')
+
+
+def write_json(path, data):
+    """
+    Writes a JSON file through a temporary file, so that the file is replaced in one step
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as file:
+        json.dump(data, file)
+    os.replace(tmp_path, path)
+
+
+def write_store(directory, source_path, trials, label_columns):
+    """
+    Writes the trials of a data file as a columnar store, see stream_store
+    :param directory: the directory of the store, replaced if it exists
+    :param source_path: path to the data file, whose size, modification time and digest are recorded
+    :param trials: the trials of the data file, as produced by iter_trials with the label columns
+    :param label_columns: the names of the label columns the trials carry
+    """
+    for _ in stream_store(directory, source_path, trials, label_columns):
+        pass
+
+
+def stream_store(directory, source_path, trials, label_columns):
+    """
+    Writes the trials of a data file as a columnar store: one .npy file per column of all the gazes back to back,
+    a table of the trials with the offset and count of their rows, and the label columns as integer codes into a
+    vocabulary. The columns are written out as the trials arrive, so memory is bounded by a trial rather than by the
+    data file, and each trial is passed on once it is written, so that it can be computed while the rest of the data
+    file is still being read. The store is written to a temporary directory first and only moved into place once the
+    last trial is written, so that a store is never seen half written; if the generator is not run to the end, no
+    store is written.
+    :param directory: the directory of the store, replaced if it exists
+    :param source_path: path to the data file, whose size, modification time and digest are recorded
+    :param trials: the trials of the data file, as produced by iter_trials with the label columns
+    :param label_columns: the names of the label columns the trials carry
+    :return: a generator of the trials, as they are written
+    """
+    tmp_directory = directory + '.tmp'
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+    columns = {name: ColumnWriter(os.path.join(tmp_directory, name + '.npy'), np.float64)
+               for name in COORDINATE_COLUMNS}
+    label_files = {column: "labels_{}.npy".format(k) for k, column in enumerate(label_columns)}
+    label_codes = {column: ColumnWriter(os.path.join(tmp_directory, label_files[column]), np.int32)
+                   for column in label_columns}
+    vocabularies = {column: {} for column in label_columns}
+    trial_table = ColumnWriter(os.path.join(tmp_directory, 'trials.npy'), np.int64, (4,))
+    writers = list(columns.values()) + list(label_codes.values()) + [trial_table]
+    offset = 0
+    try:
+        for trial in trials:
+            (file_num, trial_num), circles, _ = trial
+            for name in COORDINATE_COLUMNS:
+                columns[name].append(getattr(circles, name))
+            for column in label_columns:
+                vocabulary = vocabularies[column]
+                label_codes[column].append([vocabulary.setdefault(label, len(vocabulary))
+                                            for label in circles.labels[column]])
+            trial_table.append((file_num, trial_num, offset, len(circles)))
+            offset += len(circles)
+            yield trial
+    except BaseException:
+        for writer in writers:
+            writer.raw_file.close()
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        raise
+
+    for writer in writers:
+        writer.finish()
+    labels = {column: {'file': label_files[column], 'vocabulary': list(vocabularies[column])}
+              for column in label_columns}
+
+    stat = os.stat(source_path)
+    meta = {'version': STORE_VERSION, 'source': os.path.abspath(source_path), 'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns, 'sha256': file_digest(source_path), 'num_rows': offset, 'labels': labels}
+    write_json(os.path.join(tmp_directory, 'meta.json'), meta)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_directory, directory)
+
+
+def is_current(directory, source_path) -> bool:
+    """
+    Checks whether a store still matches its data file. The size and modification time are compared first; if only
+    the modification time differs, the content is hashed, so that a data file which was touched but not changed does
+    not have to be ingested again.
+    :param directory: the directory of the store
+    :param source_path: path to the data file
+    :return: True if the store exists and holds the data file's current content
+    """
+    try:
+        with open(os.path.join(directory, 'meta.json'), 'r') as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return False
+    stat = os.stat(source_path)
+    if meta.get('version') != STORE_VERSION or meta['size'] != stat.st_size:
+        return False
+    if meta['mtime_ns'] == stat.st_mtime_ns:
+        return True
+    if meta['sha256'] != file_digest(source_path):
+        return False
+    meta['mtime_ns'] = stat.st_mtime_ns
+    write_json(os.path.join(directory, 'meta.json'), meta)
+    return True
+
+
+class GazeStore:
+    """
+    The gazes of a data file read back from a columnar store. The columns are memory mapped, so opening a store
+    reads nothing but its table of trials, and each trial's rows are only read when the trial is.
+    """
+
+    def __init__(self, directory):
+        """
+        directory: the directory of a store written by write_store
+        """
+        with open(os.path.join(directory, 'meta.json'), 'r') as file:
+            self.meta = json.load(file)
+        self.columns = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode='r')
+                        for name in COORDINATE_COLUMNS}
+        self.labels = {column: (np.load(os.path.join(directory, label['file']), mmap_mode='r'), label['vocabulary'])
+                       for column, label in self.meta['labels'].items()}
+        self.trials = np.load(os.path.join(directory, 'trials.npy')).tolist()
+
+    def __len__(self):
+        return len(self.trials)
+
+    def iter_trials(self, label_columns=()):
+        """
+        :param label_columns: the names of the label columns to attach to the circles, they must be in the store
+        :return: a generator of ((file number, trial number), CircleSet of the gazes in gaze_num order, bounding box
+        of the trial), like iter_trials
+        """
+        for file_num, trial_num, offset, count in self.trials:
+            labels = None
+            if label_columns:
+                labels = {}
+                for column in label_columns:
+                    codes, vocabulary = self.labels[column]
+                    labels[column] = [vocabulary[code] for code in codes[offset:offset + count].tolist()]
+            circles = CircleSet(*(self.columns[name][offset:offset + count] for name in COORDINATE_COLUMNS), labels)
+            yield (file_num, trial_num), circles, bounding_box(circles)
@@ -0,0 +1,144 @@
+import json
+import os
+import queue
+import sys
+import threading
+from time import perf_counter, time
+
+
+# the least number of seconds between two progress reports
+PROGRESS_INTERVAL = 1.0
+
+
+class ProgressReporter:
+    """
+    Collects how far the computation of a trial has got, e.g. the rows or samples processed, and passes it on to a
+    sink at most once per interval. Updating is cheap, but the row by row engines still only call it every few rows.
+    """
+
+    def __init__(self, sink, label, interval=PROGRESS_INTERVAL):
+        """
+        sink: a function taking a progress message, e.g. the put method of a multiprocessing queue
+        label: names the trial in the messages
+        interval: the least number of seconds between two messages
+        """
+        self.sink = sink
+        self.label = label
+        self.interval = interval
+        self.start = perf_counter()
+        self.last_sent = self.start
+        self.counts = {}
+
+    def update(self, kind, done, total=None):
+        """
+        :param kind: what is being counted, e.g. 'rows' or 'samples'
+        :param done: how many have been processed so far
+        :param total: how many there will be in all, if known
+        """
+        self.counts[kind] = (done, total)
+        now = perf_counter()
+        if now - self.last_sent >= self.interval:
+            self.last_sent = now
+            self.send('running')
+
+    def finish(self):
+        self.send('finished')
+
+    def send(self, status):
+        self.sink({'label': self.label, 'status': status, 'elapsed': perf_counter() - self.start,
+                   'counts': dict(self.counts)})
+
+
+def format_progress(message) -> str:
+    """
+    :param message: a message from a ProgressReporter
+    :return: the message as one line of text, with the rate and the estimated time left of every count
+    """
+    parts = [message['label']]
+    for kind, (done, total) in message['counts'].items():
+        rate = done / message['elapsed'] if message['elapsed'] > 0 else 0.0
+        if total:
+            eta = (total - done) / rate if rate > 0 else float('inf')
+            parts.append("{} {}/{} ({:.0f}/s, ETA {:.0f}s)".format(kind, done, total, rate, eta))
+        else:
+            parts.append("{} {} ({:.0f}/s)".format(kind, done, rate))
+    return " ".join(parts)
+
+
+def console_sink(message):
+    """
+    Prints progress messages to stderr, for computations running in the current process
+    """
+    if message['status'] == 'running':
+        print(format_progress(message), file=sys.stderr)
+
+
+class ProgressMonitor(threading.Thread):
+    """
+    Gathers the progress messages that the workers send on a queue. At most once per interval it prints a summary
+    of the running trials, unless quiet, and rewrites the metrics file, if there is one, as JSON.
+    """
+
+    def __init__(self, progress_queue, quiet=False, metrics_path=None, interval=PROGRESS_INTERVAL):
+        """
+        progress_queue: the queue the workers' ProgressReporters send to
+        quiet: if True, nothing is printed
+        metrics_path: path of the JSON metrics file, or None
+        interval: the least number of seconds between two summaries
+        """
+        threading.Thread.__init__(self, daemon=True)
+        self.progress_queue = progress_queue
+        self.quiet = quiet
+        self.metrics_path = metrics_path
+        self.interval = interval
+        self.start_time = perf_counter()
+        self.num_queued = 0
+        self.num_finished = 0
+        self.totals = {}
+        self.running = {}
+
+    def run(self):
+        last_flush = perf_counter()
+        while True:
+            try:
+                message = self.progress_queue.get(timeout=self.interval)
+            except queue.Empty:
+                message = {}
+            if message is None:
+                break
+            if message:
+                self.handle(message)
+            if perf_counter() - last_flush >= self.interval:
+                last_flush = perf_counter()
+                self.flush()
+        self.flush()
+
+    def handle(self, message):
+        if message['status'] == 'finished':
+            self.running.pop(message['label'], None)
+            self.num_finished += 1
+            for kind, (done, _) in message['counts'].items():
+                self.totals[kind] = self.totals.get(kind, 0) + done
+        else:
+            self.running[message['label']] = message
+
+    def flush(self):
+        if not self.quiet and self.running:
+            print("{}/{} trials done".format(self.num_finished, self.num_queued), file=sys.stderr)
+            for message in self.running.values():
+                print("  " + format_progress(message), file=sys.stderr)
+        if self.metrics_path is not None:
+            metrics = {'time': time(), 'elapsed': perf_counter() - self.start_time, 'trials_queued': self.num_queued,
+                       'trials_finished': self.num_finished, 'totals': self.totals,
+                       'running': list(self.running.values())}
+            tmp_path = self.metrics_path + '.tmp'
+            with open(tmp_path, 'w') as file:
+                json.dump(metrics, file)
+            os.replace(tmp_path, self.metrics_path)
+
+    def stop(self):
+        """
+        Stops the monitor once it has handled every message sent so far, and writes the metrics one last time
+        """
+        self.progress_queue.put(None)
+        self.join()
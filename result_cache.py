@@ -0,0 +1,96 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+from area_engines import circle_arrays
+
+
+def trial_cache_key(circles, **params) -> str:
+    """
+    Hashes the content of a trial together with everything that affects its result, so that a trial with the same
+    circles and parameters maps to the same key whichever file or position it comes from
+    :param circles: list of Circle objects
+    :param params: the engines and their parameters, e.g. step size, error tolerance and seed
+    :return: the key as a hex string
+    """
+    digest = hashlib.sha256()
+    for column in circle_arrays(circles):
+        digest.update(column.tobytes())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    A size bounded on-disk cache of trial results. Each result is stored as a JSON file named after its key, and the
+    least recently used results are evicted once the files take up more than the size limit.
+    """
+
+    def __init__(self, directory, max_bytes):
+        """
+        directory: the directory to keep the results in, created if it does not exist
+        max_bytes: the most bytes the results may take up
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        # key -> size of its file, least recently used first; a file's modification time records when it was last used
+        self.entries = OrderedDict()
+        paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.json')]
+        for path in sorted(paths, key=os.path.getmtime):
+            self.entries[os.path.basename(path)[:-len('.json')]] = os.path.getsize(path)
+        self.total_bytes = sum(self.entries.values())
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """
+        :param key: a key from trial_cache_key
+        :return: the cached result, or None if there is none
+        """
+        if key not in self.entries:
+            return None
+        try:
+            with open(self.path(key), 'r') as file:
+                record = json.load(file)
+            os.utime(self.path(key))
+        except (OSError, ValueError):
+            self.total_bytes -= self.entries.pop(key)
+            return None
+        self.entries.move_to_end(key)
+        return record
+
+    def put(self, key, record):
+        """
+        :param key: a key from trial_cache_key
+        :param record: the result to cache, must be serializable as JSON
+        """
+        tmp_path = self.path(key) + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(record, file)
+        # replace the file in one step, so that a crash never leaves half a result behind
+        os.replace(tmp_path, self.path(key))
+        self.total_bytes -= self.entries.pop(key, 0)
+        self.entries[key] = os.path.getsize(self.path(key))
+        self.total_bytes += self.entries[key]
+
+        while self.total_bytes > self.max_bytes and self.entries:
+            evicted, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self.path(evicted))
+            except OSError:
+                pass
+
+    def clear(self):
+        """
+        Removes every cached result
+        """
+        for key in self.entries:
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+        self.entries.clear()
+        self.total_bytes = 0
@@ -0,0 +1,131 @@
+import math
+import os
+from typing import List, Tuple
+
+
+# the engines which scan the bounding box row by row, so that a trial can be split into bands of rows
+ROW_ENGINES = ('scanline', 'sweep', 'vectorized')
+
+# a trial estimated to cost more than this many chord evaluations is split into bands of rows
+BAND_SPLIT_COST = 1 << 24
+
+# the cost of the exact engine for every pair of gazes, in chord evaluations of the scanline, measured on the bundled
+# data file
+EXACT_PAIR_COST = 3.0
+
+# the cost of the adaptive engine for every pair of gazes and every halving of its error target relative to the
+# height of the trial, in chord evaluations of the scanline, measured on the bundled data file
+ADAPTIVE_PAIR_COST = 12.0
+
+# the samples of the first round of the Monte Carlo samplers, each later round doubles them
+MONTE_CARLO_FIRST_ROUND = 65536
+
+# the cost of one sample of each Monte Carlo sampler, in chord evaluations of the scanline, measured on the bundled
+# data file
+SAMPLE_COSTS = {'uniform': 3.0, 'vectorized': 0.35, 'stratified': 0.3, 'halton': 1.6, 'importance': 0.6}
+
+# the share of the samples of plain uniform sampling which the samplers that reduce the variance need
+VARIANCE_FACTORS = {'stratified': 0.25, 'halton': 0.25, 'importance': 0.25}
+
+
+def default_num_workers() -> int:
+    """
+    :return: the number of worker processes to start when none is given, one per CPU
+    """
+    return os.cpu_count() or 1
+
+
+def trial_rows(min_max_data, step_size: int) -> Tuple[int, int]:
+    """
+    :param min_max_data: the bounding box of a trial
+    :param step_size: the scanline step is 1 / 2 ^ step_size
+    :return: the indices of the first and the last row the scanline visits
+    """
+    step = 1 / (1 << step_size)
+    return int(math.floor(min_max_data['y_min'] / step)), int(math.ceil(min_max_data['y_max'] / step))
+
+
+def estimate_cost(area_engine: str, min_max_data, num_gazes: int, step_size: int, error_target=None) -> float:
+    """
+    Estimates how long the area of a trial takes, in chord evaluations. Only the order of the estimates matters, they
+    are used to start the costliest trials first and to decide which trials to split.
+    :param area_engine: the engine which calculates the area
+    :param min_max_data: the bounding box of the trial
+    :param num_gazes: the number of gazes of the trial
+    :param step_size: the scanline step is 1 / 2 ^ step_size
+    :param error_target: the absolute error target of the adaptive engine, by default the scanline step
+    :return: the estimated cost
+    """
+    if area_engine in ROW_ENGINES:
+        first_row, last_row = trial_rows(min_max_data, step_size)
+        return float(last_row - first_row + 1) * num_gazes
+    if area_engine == 'adaptive':
+        # the pieces are refined until they meet their share of the target, each chord width tests every gaze
+        if error_target is None:
+            error_target = 1 / (1 << step_size)
+        height = min_max_data['y_max'] - min_max_data['y_min']
+        return ADAPTIVE_PAIR_COST * num_gazes * num_gazes * max(1.0, math.log2(height / error_target))
+    # the exact engine intersects every pair of gazes
+    return EXACT_PAIR_COST * num_gazes * num_gazes
+
+
+def monte_carlo_cost(monte_carlo_sampler: str, min_max_data, radius, error_tolerance: float) -> float:
+    """
+    Estimates how long the Monte Carlo estimate of a trial takes, in chord evaluations, from the number of samples
+    needed to meet the tolerance. The share of the bounding box the gazes cover is guessed as if the gazes were
+    scattered at random, 1 - exp(-(area of the gazes) / (area of the box)), and uniform sampling needs
+    9 * (1 - p) / p * (100 / tolerance) ^ 2 samples for 3 standard deviations to be within the tolerance.
+    :param monte_carlo_sampler: one of the Monte Carlo samplers
+    :param min_max_data: the bounding box of the trial
+    :param radius: the radii of the gazes, an array
+    :param error_tolerance: the upper bound for 3 * standard deviation, as a percentage of the estimated area
+    :return: the estimated cost
+    """
+    box_area = (min_max_data['x_max'] - min_max_data['x_min']) * (min_max_data['y_max'] - min_max_data['y_min'])
+    coverage = 1 - math.exp(-math.pi * float((radius ** 2).sum()) / box_area) if box_area > 0 else 1.0
+    samples = MONTE_CARLO_FIRST_ROUND
+    if coverage > 0:
+        needed = 9 * (1 - coverage) / coverage * (100 / error_tolerance) ** 2 \
+            * VARIANCE_FACTORS.get(monte_carlo_sampler, 1.0)
+        # the rounds double the samples until the tolerance is met
+        while samples < needed:
+            samples *= 2
+    return samples * SAMPLE_COSTS.get(monte_carlo_sampler, 1.0)
+
+
+def row_bands(first_row: int, last_row: int, num_bands: int) -> List[Tuple[int, int]]:
+    """
+    Splits a range of rows into contiguous bands of nearly the same number of rows
+    :param first_row: the index of the first row
+    :param last_row: the index of the last row
+    :param num_bands: the number of bands wanted
+    :return: the (first row, last row) of every band, from the bottom up
+    """
+    num_rows = last_row - first_row + 1
+    num_bands = max(1, min(num_bands, num_rows))
+    bands = []
+    for i in range(num_bands):
+        band_first = first_row + num_rows * i // num_bands
+        band_last = first_row + num_rows * (i + 1) // num_bands - 1
+        bands.append((band_first, band_last))
+    return bands
+
+
+def plan_bands(area_engine: str, min_max_data, num_gazes: int, step_size: int,
+               num_workers: int) -> List[Tuple[int, int]]:
+    """
+    Decides whether a trial is worth splitting into bands of rows for several workers to scan in parallel
+    :param area_engine: the engine which calculates the area
+    :param min_max_data: the bounding box of the trial
+    :param num_gazes: the number of gazes of the trial
+    :param step_size: the scanline step is 1 / 2 ^ step_size
+    :param num_workers: the number of worker processes, a trial is never split into more bands
+    :return: the (first row, last row) of every band, or an empty list if the trial is computed whole
+    """
+    if area_engine not in ROW_ENGINES or num_workers < 2:
+        return []
+    cost = estimate_cost(area_engine, min_max_data, num_gazes, step_size)
+    if cost <= BAND_SPLIT_COST:
+        return []
+    first_row, last_row = trial_rows(min_max_data, step_size)
+    return row_bands(first_row, last_row, min(num_workers, int(math.ceil(cost / BAND_SPLIT_COST))))
@@ -0,0 +1,45 @@
+from typing import List, Tuple
+from multiprocessing import shared_memory
+import numpy as np
+from area_engines import circle_arrays
+
+
+def share_trials(trials) -> Tuple[shared_memory.SharedMemory, List[Tuple[int, int]]]:
+    """
+    Copies the circles of several trials into one block of shared memory, laid out as three float64 columns:
+    the x coordinates of the centers, the y coordinates of the centers and the radii. The creator of the block
+    must close and unlink it once no task refers to it any more.
+    :param trials: list of trials, each a list of Circle objects
+    :return: the shared memory block, and the (offset, count) of each trial's rows in the block
+    """
+    num_rows = sum(len(circles) for circles in trials)
+    # a block cannot be empty, so always allocate at least one row
+    block = shared_memory.SharedMemory(create=True, size=3 * max(1, num_rows) * 8)
+    columns = np.ndarray((3, num_rows), dtype=np.float64, buffer=block.buf)
+
+    offsets = []
+    offset = 0
+    for circles in trials:
+        count = len(circles)
+        columns[0, offset:offset + count], columns[1, offset:offset + count], \
+            columns[2, offset:offset + count] = circle_arrays(circles)
+        offsets.append((offset, count))
+        offset += count
+
+    del columns
+    return block, offsets
+
+
+def trial_columns(block: shared_memory.SharedMemory, num_rows: int, offset: int,
+                  count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns views of one trial's rows of a block created by share_trials, without copying them. The views must be
+    released before the block is closed.
+    :param block: the shared memory block
+    :param num_rows: the total number of rows in the block
+    :param offset: the first row of the trial
+    :param count: the number of rows of the trial
+    :return: the x coordinates of the centers, the y coordinates of the centers and the radii
+    """
+    columns = np.ndarray((3, num_rows), dtype=np.float64, buffer=block.buf)
+    return columns[0, offset:offset + count], columns[1, offset:offset + count], columns[2, offset:offset + count]
@@ -0,0 +1,111 @@
+import os
+import random
+import sys
+from functools import lru_cache
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ConcurrentCircles import LABEL_COLUMNS, label_breakdown, load_trials
+from area_engines import AREA_ENGINES, MONTE_CARLO_SAMPLERS, adaptive_area, area_timeline, bounding_box, exact_area, \
+    intersection_area, sweep_intersection_area, trial_area, trial_monte_carlo, vectorized_intersection_area
+from benchmark import read_circles
+from circles import Circle, CircleSet
+from scheduler import trial_rows
+
+
+def bundled_trials():
+    """
+    :return: (name, circles, step size) of every trial of the bundled data file and of the bundled circle set, the
+    step size being fine enough for the scanline to come within 1e-6 of the exact area
+    """
+    data_file_path = os.path.join(ROOT, '0322_experiment_data_corrected.csv')
+    trials = [("{}:{}".format(file_num, trial_num), circles, 7)
+              for (file_num, trial_num), circles, _ in load_trials(data_file_path)]
+    trials.append(('test.txt', CircleSet.from_circles(read_circles(os.path.join(ROOT, 'test.txt'))), 10))
+    return trials
+
+
+TRIALS = bundled_trials()
+TRIAL_IDS = [name for name, _, _ in TRIALS]
+
+
+@lru_cache(maxsize=None)
+def scanline_area(k):
+    """
+    :param k: the index of a trial in TRIALS
+    :return: the area of the trial according to the reference scanline, intersection_area
+    """
+    _, circles, step_size = TRIALS[k]
+    y_min, y_max = trial_rows(bounding_box(circles), step_size)
+    return intersection_area(circles, y_min, y_max, 1 / (1 << step_size))
+
+
+@pytest.mark.parametrize('k', range(len(TRIALS)), ids=TRIAL_IDS)
+@pytest.mark.parametrize('engine', [sweep_intersection_area, vectorized_intersection_area],
+                         ids=['sweep', 'vectorized'])
+def test_scanline_engines_match_intersection_area(engine, k):
+    _, circles, step_size = TRIALS[k]
+    y_min, y_max = trial_rows(bounding_box(circles), step_size)
+    # the same rows and chords are summed in another order, only rounding differs
+    assert engine(circles, y_min, y_max, 1 / (1 << step_size)) == pytest.approx(scanline_area(k), rel=1e-12,
+                                                                                 abs=1e-9)
+
+
+@pytest.mark.parametrize('k', range(len(TRIALS)), ids=TRIAL_IDS)
+def test_exact_area_matches_intersection_area(k):
+    _, circles, _ = TRIALS[k]
+    assert exact_area(circles) == pytest.approx(scanline_area(k), rel=1e-6)
+
+
+@pytest.mark.parametrize('k', range(len(TRIALS)), ids=TRIAL_IDS)
+def test_adaptive_area_matches_exact_area(k):
+    _, circles, _ = TRIALS[k]
+    area, _ = adaptive_area(circles, 1e-7)
+    assert area == pytest.approx(exact_area(circles), rel=1e-9)
+
+
+@pytest.mark.parametrize('decompose', [False, True], ids=['whole', 'decomposed'])
+def test_adaptive_area_meets_its_error_target(decompose):
+    # 40 disjoint clusters, the error target is for the whole trial and not for each cluster
+    circles = CircleSet.from_circles([Circle(100 * i, 50 * (i % 5), 30) for i in range(40)])
+    area, _ = trial_area('adaptive', circles, bounding_box(circles), 0, decompose, error_target=5)
+    assert abs(area - exact_area(circles)) <= 5
+
+
+@pytest.mark.parametrize('k', range(len(TRIALS)), ids=TRIAL_IDS)
+def test_area_timeline_ends_at_exact_area(k):
+    _, circles, _ = TRIALS[k]
+    timeline = area_timeline(circles)
+    assert len(timeline) == len(circles)
+    assert all(earlier <= later for earlier, later in zip(timeline, timeline[1:]))
+    assert timeline[-1] == pytest.approx(exact_area(circles), rel=1e-12)
+
+
+@pytest.mark.parametrize('decompose', [False, True], ids=['whole', 'decomposed'])
+@pytest.mark.parametrize('engine', AREA_ENGINES)
+def test_label_areas_match_the_engine(engine, decompose):
+    data_file_path = os.path.join(ROOT, '0322_experiment_data_corrected.csv')
+    for _, circles, min_max_data in list(load_trials(data_file_path, LABEL_COLUMNS))[:4]:
+        _, label_areas, label_overlaps = label_breakdown(circles, min_max_data, 3, engine, True, decompose)
+        for column, labels in circles.labels.items():
+            for label, area in label_areas[column].items():
+                gazes = CircleSet.from_circles([circle for circle, circle_label in zip(circles, labels)
+                                                if circle_label == label])
+                assert area == pytest.approx(trial_area(engine, gazes, gazes.min_max_data, 3, decompose)[0],
+                                             rel=1e-12, abs=1e-9)
+            for label, other_label, overlap in label_overlaps[column]:
+                assert 0 <= overlap <= min(label_areas[column][label], label_areas[column][other_label])
+
+
+@pytest.mark.parametrize('decompose', [False, True], ids=['whole', 'decomposed'])
+@pytest.mark.parametrize('sampler', MONTE_CARLO_SAMPLERS)
+def test_monte_carlo_samplers_meet_their_tolerance(sampler, decompose):
+    random.seed(0)
+    for k, (_, circles, _) in enumerate(TRIALS[:3]):
+        area, std_dev, samples = trial_monte_carlo(sampler, circles, bounding_box(circles), 1.0, (0, k),
+                                                   decompose)[-1]
+        assert samples > 0
+        assert 3 * std_dev <= area * 1.0 / 100
+        assert abs(area - exact_area(circles)) <= 4 * std_dev
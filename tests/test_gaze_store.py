@@ -0,0 +1,70 @@
+import os
+import shutil
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ConcurrentCircles import LABEL_COLUMNS, iter_trials, load_trials
+from gaze_store import is_current, store_directory
+
+
+@pytest.fixture
+def data_file_path(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    shutil.copy(os.path.join(ROOT, '0322_experiment_data_corrected.csv'), path)
+    return path
+
+
+def assert_same_trials(trials, expected_trials):
+    trials, expected_trials = list(trials), list(expected_trials)
+    assert len(trials) == len(expected_trials)
+    for (key, circles, min_max_data), (expected_key, expected_circles, expected_min_max_data) in \
+            zip(trials, expected_trials):
+        assert key == expected_key
+        assert circles == expected_circles
+        assert circles.labels == expected_circles.labels
+        assert min_max_data == expected_min_max_data
+
+
+@pytest.mark.parametrize('label_columns', [(), LABEL_COLUMNS[:1], LABEL_COLUMNS], ids=['none', 'one', 'all'])
+def test_store_trials_match_iter_trials(tmp_path, data_file_path, label_columns):
+    store_root = str(tmp_path / 'store')
+    # the first run writes the store while passing the trials on, the second reads them back from the store
+    assert_same_trials(load_trials(data_file_path, label_columns, store_root),
+                       iter_trials(data_file_path, label_columns))
+    assert is_current(store_directory(store_root, data_file_path), data_file_path)
+    assert_same_trials(load_trials(data_file_path, label_columns, store_root),
+                       iter_trials(data_file_path, label_columns))
+
+
+def test_changed_data_file_is_ingested_again(tmp_path, data_file_path):
+    store_root = str(tmp_path / 'store')
+    list(load_trials(data_file_path, LABEL_COLUMNS, store_root))
+    directory = store_directory(store_root, data_file_path)
+    assert is_current(directory, data_file_path)
+
+    # drop the last trial
+    with open(data_file_path, 'r') as file:
+        lines = file.readlines()
+    last_trial = lines[-1].split(',')[:2]
+    with open(data_file_path, 'w') as file:
+        file.writelines(line for line in lines if line.split(',')[:2] != last_trial)
+    assert not is_current(directory, data_file_path)
+
+    assert_same_trials(load_trials(data_file_path, LABEL_COLUMNS, store_root),
+                       iter_trials(data_file_path, LABEL_COLUMNS))
+    assert is_current(directory, data_file_path)
+    assert_same_trials(load_trials(data_file_path, LABEL_COLUMNS, store_root),
+                       iter_trials(data_file_path, LABEL_COLUMNS))
+
+
+def test_store_is_not_written_by_a_partial_read(tmp_path, data_file_path):
+    store_root = str(tmp_path / 'store')
+    trials = load_trials(data_file_path, (), store_root)
+    next(trials)
+    trials.close()
+    directory = store_directory(store_root, data_file_path)
+    assert not is_current(directory, data_file_path)
+    assert not os.path.exists(directory + '.tmp')